@@ -75,10 +75,13 @@ async def delete_category(name: str):
     # Delete category directory
     shutil.rmtree(category_path)
 
-    # Delete progress file if exists
-    progress_file = settings.progress_path / f"{name}.json"
-    if progress_file.exists():
-        progress_file.unlink()
+    # Delete progress file (and its change log) if exists
+    for progress_file in (
+        settings.progress_path / f"{name}.json",
+        settings.progress_path / f"{name}.log.jsonl",
+    ):
+        if progress_file.exists():
+            progress_file.unlink()
 
     return {"success": True, "message": f"Category '{name}' deleted"}
 
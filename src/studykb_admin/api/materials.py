@@ -170,10 +170,11 @@ async def delete_material(category: str, material: str):
     # Delete material file
     material_path.unlink()
 
-    # Delete index files if exist (CSV and MD)
+    # Delete index files if exist (CSV and MD), plus the hidden line-offset
+    # side-car the MCP server keeps for range reads
     stem = material_path.stem
-    for ext in ["_index.csv", "_index.md"]:
-        index_path = category_path / f"{stem}{ext}"
+    for index_name in [f"{stem}_index.csv", f"{stem}_index.md", f".{material_name}.lineidx"]:
+        index_path = category_path / index_name
         if index_path.exists():
             index_path.unlink()
 
@@ -39,7 +39,7 @@ async def list_workspace_files(category: str, progress_id: str):
     return {
         "category": category,
         "progress_id": progress_id,
-        "files": files,
+        "files": [f._asdict() for f in files],
     }
 
 
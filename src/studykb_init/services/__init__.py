@@ -5,6 +5,7 @@ without depending on the MCP server modules.
 """
 
 import json
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -121,7 +122,40 @@ class ProgressService:
             }
 
         with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            snapshot_stat = os.fstat(f.fileno())
+            progress = json.load(f)
+
+        self._replay_log(category, progress, snapshot_stat)
+        return progress
+
+    def _replay_log(self, category: str, progress: dict, snapshot_stat: os.stat_result) -> None:
+        """Apply changes the MCP server appended to {category}.log.jsonl."""
+        log_path = self.progress_path / f"{category}.log.jsonl"
+        if not log_path.exists():
+            return
+
+        with open(log_path, encoding="utf-8") as f:
+            lines = f.readlines()
+
+        snapshot_id = f"{snapshot_stat.st_ino}:{snapshot_stat.st_mtime_ns}:{snapshot_stat.st_size}"
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            return
+        if not header or header.get("snapshot") != snapshot_id:
+            return
+
+        entries = progress.setdefault("entries", {})
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if record["op"] == "put":
+                entries[record["id"]] = record["entry"]
+            elif record["op"] == "delete":
+                entries.pop(record["id"], None)
+            progress["last_updated"] = record["last_updated"]
 
     async def _save_progress_file(self, category: str, progress: dict) -> None:
         """Save progress file for a category."""
@@ -137,3 +171,6 @@ class ProgressService:
 
         # Atomic replace
         temp_path.replace(file_path)
+
+        # The full rewrite supersedes the MCP server's change log
+        (self.progress_path / f"{category}.log.jsonl").unlink(missing_ok=True)
@@ -1,13 +1,18 @@
 """Progress tracking data models."""
 
+import heapq
+from collections import Counter
 from datetime import datetime
+from operator import attrgetter
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 # Progress status type
 ProgressStatus = Literal["active", "done", "review", "pending"]
 
+_status_of = attrgetter("status")
+
 
 class RelatedSection(BaseModel):
     """A related section in a material file."""
@@ -38,16 +43,141 @@ class ProgressFile(BaseModel):
     last_updated: datetime
     entries: dict[str, ProgressEntry] = Field(default_factory=dict)
 
+    # Min-heap of (next_review_at, entry_id) over done entries, so due reviews
+    # are found without scanning; in memory only, never persisted. Items whose
+    # entry has since changed or been removed are dropped when they surface.
+    _review_heap: list[tuple[datetime, str]] = PrivateAttr(default_factory=list)
+
+    # Memoized status_groups() result; put_entry() and pop_entry() reset it
+    _status_groups: dict[str, list[tuple[str, ProgressEntry]]] | None = PrivateAttr(
+        default=None
+    )
+
+    @classmethod
+    def from_status_groups(
+        cls,
+        category: str,
+        last_updated: datetime,
+        groups: dict[str, list[tuple[str, ProgressEntry]]],
+    ) -> "ProgressFile":
+        """Build a file from already partitioned, newest-first status groups.
+
+        The groups become the memoized status_groups() result, so they are
+        not partitioned and sorted a second time; missing statuses are empty.
+        """
+        progress_file = cls(
+            category=category,
+            last_updated=last_updated,
+            entries={entry_id: entry for group in groups.values() for entry_id, entry in group},
+        )
+        progress_file._status_groups = {
+            status: groups.get(status, []) for status in ("active", "review", "done", "pending")
+        }
+        return progress_file
+
+    def model_post_init(self, __context: object) -> None:
+        self.rebuild_review_heap()
+
+    def put_entry(self, entry_id: str, entry: ProgressEntry) -> None:
+        """Insert or replace an entry, keeping the review heap current."""
+        self.entries[entry_id] = entry
+        self._status_groups = None
+        if entry.status == "done" and entry.next_review_at is not None:
+            heapq.heappush(self._review_heap, (entry.next_review_at, entry_id))
+            if len(self._review_heap) > 2 * len(self.entries) + 64:
+                self.rebuild_review_heap()  # too many stale items
+
+    def pop_entry(self, entry_id: str) -> ProgressEntry | None:
+        """Remove an entry and return it, or None if it doesn't exist.
+
+        Stale review heap items are dropped when they surface.
+        """
+        entry = self.entries.pop(entry_id, None)
+        if entry is not None:
+            self._status_groups = None
+        return entry
+
+    def rebuild_review_heap(self) -> None:
+        """Recompute the review heap from the current entries."""
+        heap = [
+            (entry.next_review_at, entry_id)
+            for entry_id, entry in self.entries.items()
+            if entry.status == "done" and entry.next_review_at is not None
+        ]
+        heapq.heapify(heap)
+        self._review_heap = heap
+
+    def _is_current(self, item: tuple[datetime, str]) -> bool:
+        review_at, entry_id = item
+        entry = self.entries.get(entry_id)
+        return entry is not None and entry.status == "done" and entry.next_review_at == review_at
+
+    def reviews_may_be_due(self, now: datetime) -> bool:
+        """Return True if some done entry has reached its review time."""
+        heap = self._review_heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        return bool(heap) and now >= heap[0][0]
+
+    def pop_due_reviews(self, now: datetime) -> list[str]:
+        """Remove due items from the review heap and return their entry IDs.
+
+        The caller is expected to move the returned entries out of "done".
+        """
+        heap = self._review_heap
+        due: list[str] = []
+        while heap and now >= heap[0][0]:
+            item = heapq.heappop(heap)
+            if self._is_current(item) and item[1] not in due:
+                due.append(item[1])
+        return due
+
+    def snapshot(self) -> "ProgressFile":
+        """Shallow copy with its own entries dict and review heap."""
+        copy = self.model_copy(update={"entries": dict(self.entries)})
+        copy._review_heap = list(self._review_heap)
+        return copy
+
+    def status_groups(self) -> dict[str, list[tuple[str, ProgressEntry]]]:
+        """Entries partitioned by status, each group newest updated_at first.
+
+        Computed once and memoized; put_entry() and pop_entry() reset it, so
+        all changes to ``entries`` must go through them.
+        """
+        if self._status_groups is None:
+            groups: dict[str, list[tuple[str, ProgressEntry]]] = {
+                "active": [],
+                "review": [],
+                "done": [],
+                "pending": [],
+            }
+            # One stable sort, then partition: every group stays in order
+            for entry_id, entry in sorted(
+                self.entries.items(), key=lambda item: item[1].updated_at, reverse=True
+            ):
+                groups[entry.status].append((entry_id, entry))
+            self._status_groups = groups
+        return self._status_groups
+
     def get_stats(self) -> dict[str, int]:
         """Get statistics for this progress file."""
-        stats: dict[str, int] = {
-            "active": 0,
-            "done": 0,
-            "review": 0,
-            "pending": 0,
-            "total": 0,
+        groups = self._status_groups
+        if groups is not None:
+            # Already partitioned: the counts are the group sizes
+            return {
+                "active": len(groups["active"]),
+                "done": len(groups["done"]),
+                "review": len(groups["review"]),
+                "pending": len(groups["pending"]),
+                "total": len(self.entries),
+            }
+
+        # One pass, counted in C
+        counts = Counter(map(_status_of, self.entries.values()))
+        return {
+            "active": counts["active"],
+            "done": counts["done"],
+            "review": counts["review"],
+            "pending": counts["pending"],
+            "total": len(self.entries),
         }
-        for entry in self.entries.values():
-            stats[entry.status] += 1
-            stats["total"] += 1
-        return stats
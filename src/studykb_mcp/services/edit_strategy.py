@@ -18,6 +18,7 @@ class ReplaceResult:
     content: str | None = None
     match_type: str | None = None  # "exact" | "whitespace_flexible" | "token"
     error: str | None = None
+    data: bytes | None = None  # updated content as UTF-8 (perform_replacement_bytes)
 
 
 class EditStrategy:
@@ -109,6 +110,48 @@ class EditStrategy:
             ),
         )
 
+    def perform_replacement_bytes(
+        self,
+        content: bytes,
+        old_str: str,
+        new_str: str,
+        expected_count: int = 1,
+    ) -> ReplaceResult:
+        """Perform replacement on UTF-8 encoded file content.
+
+        The exact tier runs directly on the bytes (a match of a UTF-8
+        encoded string is always a match of whole characters), so the
+        common case never decodes the file. The fuzzy tiers need str
+        semantics for ``\\s``/``\\w`` and fall back to perform_replacement.
+
+        Args:
+            content: Original file content (UTF-8)
+            old_str: String to search for
+            new_str: Replacement string
+            expected_count: Expected number of matches (default 1)
+
+        Returns:
+            ReplaceResult whose ``data`` holds the updated content on success
+        """
+        crlf = b"\r\n" in content
+        normalized_content = content.replace(b"\r\n", b"\n") if crlf else content
+        normalized_old = old_str.replace("\r\n", "\n").encode("utf-8")
+
+        # An empty needle counts byte gaps rather than character gaps
+        if normalized_old and normalized_content.count(normalized_old) == expected_count:
+            normalized_new = new_str.replace("\r\n", "\n").encode("utf-8")
+            result = normalized_content.replace(normalized_old, normalized_new)
+            if crlf:
+                result = result.replace(b"\n", b"\r\n")
+            return ReplaceResult(success=True, match_type="exact", data=result)
+
+        fallback = self.perform_replacement(
+            content.decode("utf-8"), old_str, new_str, expected_count
+        )
+        if fallback.content is not None:
+            fallback.data = fallback.content.encode("utf-8")
+        return fallback
+
     def _detect_line_ending(self, content: str) -> str:
         """Detect original line ending style.
 
@@ -10,16 +10,23 @@ Storage layout under each workspace:
             {timestamp_ms}.snapshot  # full content snapshot
 """
 
+import asyncio
 import json
 import os
+import shutil
+import threading
 import time
 from pathlib import Path
+from typing import Any
 
 import aiofiles
 import aiofiles.os
 
 from ..config import settings
 
+# Serializes read-modify-write of .history.json files across worker threads
+_meta_lock = threading.Lock()
+
 
 class HistoryService:
     """Manages version history snapshots for a single workspace directory."""
@@ -29,6 +36,7 @@ class HistoryService:
     def __init__(self, workspace_path: Path) -> None:
         self.workspace_path = workspace_path
         self.max_versions = settings.max_history_versions
+        self._last_version = 0
 
     # ── internal helpers ─────────────────────────────────────
 
@@ -43,41 +51,30 @@ class HistoryService:
         """Directory holding snapshots for a tracked file."""
         return self._history_root() / file_path
 
-    async def _read_meta(self, file_path: str) -> dict:
-        meta_path = self._meta_path(file_path)
-        if not await aiofiles.os.path.exists(meta_path):
+    def _read_meta_sync(self, file_path: str) -> dict[str, Any]:
+        try:
+            with open(self._meta_path(file_path), encoding="utf-8") as f:
+                meta: dict[str, Any] = json.load(f)
+        except FileNotFoundError:
             return {"file_path": file_path, "versions": []}
-        async with aiofiles.open(meta_path, "r", encoding="utf-8") as f:
-            return json.loads(await f.read())
-
-    async def _write_meta(self, file_path: str, meta: dict) -> None:
-        meta_path = self._meta_path(file_path)
-        await aiofiles.os.makedirs(meta_path.parent, exist_ok=True)
-        tmp = meta_path.with_suffix(".tmp")
-        async with aiofiles.open(tmp, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(meta, ensure_ascii=False, indent=2))
-        await aiofiles.os.replace(tmp, meta_path)
-
-    async def _prune_old_versions(self, file_path: str, meta: dict) -> dict:
-        """Remove oldest versions exceeding max_versions limit."""
+        return meta
+
+    def _prune_old_versions(self, file_path: str, meta: dict[str, Any]) -> None:
+        """Remove oldest versions exceeding max_versions limit (blocking)."""
         versions = meta.get("versions", [])
         if len(versions) <= self.max_versions:
-            return meta
+            return
 
         to_remove = versions[self.max_versions:]
         meta["versions"] = versions[:self.max_versions]
 
         snap_dir = self._snapshot_dir(file_path)
         for v in to_remove:
-            snap_file = snap_dir / f"{v['version_id']}.snapshot"
             try:
-                if await aiofiles.os.path.exists(snap_file):
-                    await aiofiles.os.remove(snap_file)
+                os.remove(snap_dir / f"{v['version_id']}.snapshot")
             except OSError:
                 pass
 
-        return meta
-
     # ── public API ───────────────────────────────────────────
 
     async def save_snapshot(
@@ -98,37 +95,117 @@ class HistoryService:
         Returns:
             version_id (millisecond timestamp string)
         """
-        version_id = str(int(time.time() * 1000))
+        version_id, snap_file = self.new_snapshot_file(file_path)
+        data = content.encode("utf-8")
+        lines = content.count("\n") + 1 if content else 0
 
-        # Write snapshot file
-        snap_dir = self._snapshot_dir(file_path)
-        await aiofiles.os.makedirs(snap_dir, exist_ok=True)
-        snap_file = snap_dir / f"{version_id}.snapshot"
-        async with aiofiles.open(snap_file, "w", encoding="utf-8") as f:
-            await f.write(content)
+        def save() -> None:
+            write_snapshot_file(snap_file, data)
+            self.record_snapshot_sync(
+                file_path, version_id, operation, description, len(data), lines
+            )
+
+        await asyncio.to_thread(save)
+        return version_id
+
+    async def save_snapshot_from_path(
+        self,
+        src_path: Path,
+        file_path: str,
+        operation: str,
+        description: str = "",
+    ) -> str:
+        """Save a snapshot by copying an on-disk file instead of its decoded text.
+
+        The copy happens in the kernel (``shutil.copyfile`` uses sendfile on
+        Linux), so the content never round-trips through a Python str.
+
+        Args:
+            src_path: File to snapshot
+            file_path: Relative file path within workspace (e.g. "note.md")
+            operation: One of "create", "write", "edit", "delete"
+            description: Human-readable description of the change
+
+        Returns:
+            version_id (millisecond timestamp string)
 
-        # Update metadata (newest first)
-        meta = await self._read_meta(file_path)
+        Raises:
+            FileNotFoundError: If src_path doesn't exist
+        """
+        version_id, snap_file = self.new_snapshot_file(file_path)
+
+        def save() -> None:
+            size, lines = copy_snapshot_file(src_path, snap_file)
+            self.record_snapshot_sync(file_path, version_id, operation, description, size, lines)
+
+        await asyncio.to_thread(save)
+        return version_id
+
+    def new_snapshot_file(self, file_path: str) -> tuple[str, Path]:
+        """Allocate a version id and its snapshot path (nothing is written).
+
+        For callers that write the snapshot themselves (e.g. inside a worker
+        thread that also touches the tracked file) and then call
+        :meth:`record_snapshot_sync` in the same thread.
+        """
+        # Bumped past the previous id so two changes within one millisecond
+        # (e.g. a rollback right after a write) never share a snapshot file
+        self._last_version = max(int(time.time() * 1000), self._last_version + 1)
+        version_id = str(self._last_version)
+        return version_id, self._snapshot_dir(file_path) / f"{version_id}.snapshot"
+
+    def record_snapshot_sync(
+        self,
+        file_path: str,
+        version_id: str,
+        operation: str,
+        description: str,
+        size: int,
+        lines: int,
+    ) -> None:
+        """Prepend a version entry to the file's metadata, prune and persist.
+
+        Blocking; meant to run in the same worker-thread hop that wrote the
+        snapshot, so no snapshot is left on disk without its metadata entry.
+        The metadata file is fsync'd before this returns.
+        """
         entry = {
             "version_id": version_id,
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
             "operation": operation,
             "description": description or f"文件{_OP_LABELS.get(operation, '操作')}",
-            "size": len(content.encode("utf-8")),
-            "lines": content.count("\n") + 1 if content else 0,
+            "size": size,
+            "lines": lines,
         }
-        meta["versions"].insert(0, entry)
-
-        # Prune & persist
-        meta = await self._prune_old_versions(file_path, meta)
-        await self._write_meta(file_path, meta)
+        with _meta_lock:
+            meta = self._read_meta_sync(file_path)
+            meta["versions"].insert(0, entry)  # newest first
+            self._prune_old_versions(file_path, meta)
+            _write_meta_sync(self._meta_path(file_path), meta)
 
-        return version_id
-
-    async def list_versions(self, file_path: str) -> list[dict]:
+    async def record_snapshot(
+        self,
+        file_path: str,
+        version_id: str,
+        operation: str,
+        description: str,
+        size: int,
+        lines: int,
+    ) -> None:
+        """Async wrapper around :meth:`record_snapshot_sync`."""
+        await asyncio.to_thread(
+            self.record_snapshot_sync, file_path, version_id, operation, description, size, lines
+        )
+
+    async def list_versions(self, file_path: str) -> list[dict[str, Any]]:
         """Return version list for a file (newest first)."""
-        meta = await self._read_meta(file_path)
-        return meta.get("versions", [])
+        meta = await asyncio.to_thread(self._read_meta_sync, file_path)
+        versions: list[dict[str, Any]] = meta.get("versions", [])
+        return versions
+
+    def get_version_path(self, file_path: str, version_id: str) -> Path:
+        """Path of a specific snapshot file (existence is not checked)."""
+        return self._snapshot_dir(file_path) / f"{version_id}.snapshot"
 
     async def get_version_content(self, file_path: str, version_id: str) -> str:
         """Read the content of a specific snapshot.
@@ -136,15 +213,79 @@ class HistoryService:
         Raises:
             FileNotFoundError: If snapshot file is missing.
         """
-        snap_file = self._snapshot_dir(file_path) / f"{version_id}.snapshot"
+        snap_file = self.get_version_path(file_path, version_id)
         if not await aiofiles.os.path.exists(snap_file):
             raise FileNotFoundError(f"快照不存在: {file_path} @ {version_id}")
-        async with aiofiles.open(snap_file, "r", encoding="utf-8") as f:
-            return await f.read()
+        async with aiofiles.open(snap_file, encoding="utf-8") as f:
+            content: str = await f.read()
+        return content
 
 
 # ── helpers ──────────────────────────────────────────────────
 
+def _write_meta_sync(meta_path: Path, meta: dict[str, Any]) -> None:
+    """Replace a metadata file atomically and durably."""
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = meta_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(meta, ensure_ascii=False, separators=(",", ":")))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, meta_path)
+    fsync_dir(meta_path.parent)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist renames in a directory (no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot_file(dst: Path, data: bytes) -> None:
+    """Write snapshot bytes, creating the snapshot directory if needed.
+
+    Blocking; call via ``asyncio.to_thread``.
+    """
+    try:
+        f = open(dst, "wb")
+    except FileNotFoundError:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        f = open(dst, "wb")
+    with f:
+        f.write(data)
+
+
+def copy_snapshot_file(src: Path, dst: Path) -> tuple[int, int]:
+    """Copy src to dst in the kernel; return (size, lines) for the metadata.
+
+    Blocking; call via ``asyncio.to_thread``.
+
+    Raises:
+        FileNotFoundError: If src doesn't exist (checked before dst's
+            directory is created)
+    """
+    os.stat(src)
+    try:
+        shutil.copyfile(src, dst)
+    except FileNotFoundError:
+        # Usually dst's directory; mkdir only on the first snapshot of a file
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dst)
+    size = 0
+    newlines = 0
+    with open(dst, "rb") as f:
+        while chunk := f.read(1 << 20):
+            size += len(chunk)
+            newlines += chunk.count(b"\n")
+    return size, newlines + 1 if size else 0
+
+
 _OP_LABELS: dict[str, str] = {
     "create": "创建",
     "write": "覆写",
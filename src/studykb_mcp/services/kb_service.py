@@ -1,14 +1,44 @@
 """Knowledge base service for file operations."""
 
+import asyncio
+import io
+import mmap
+import os
+import re
 import subprocess
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 import aiofiles
 import aiofiles.os
 
 from ..config import settings
 from ..models.kb import Category, Material
+from .line_index import read_lines
+
+try:
+    # Optional linear-time DFA regex engine (pip install studykb-mcp[fast])
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Materials at least this large are grepped through mmap
+MMAP_GREP_MIN_BYTES = 1024 * 1024
+
+# Listing caches, revalidated by st_mtime_ns (shared by all KBService instances)
+_category_names_cache: dict[Path, tuple[int, list[str]]] = {}
+_dir_listing_cache: dict[Path, tuple[int, frozenset[str]]] = {}
+_line_count_cache: dict[Path, tuple[int, int, int]] = {}  # path -> (mtime_ns, size, lines)
+
+
+class ContextLine(NamedTuple):
+    """One line of grep context."""
+
+    line_num: int
+    text: str
+    is_match: bool
 
 
 @dataclass
@@ -16,7 +46,7 @@ class GrepMatch:
     """A single grep match with context."""
 
     line_num: int
-    context: list[dict[str, int | str | bool]]
+    context: list[ContextLine]
 
 
 @dataclass
@@ -28,6 +58,206 @@ class GrepResult:
     total_matches: int
 
 
+def _read_index_sync(category_path: Path, stem: str) -> str | None:
+    """Read the first existing index file for a material (blocking)."""
+    # CSV 优先，MD 回退
+    for ext in ("csv", "md"):
+        try:
+            return (category_path / f"{stem}_index.{ext}").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def _list_category_names_sync(kb_path: Path) -> list[str]:
+    """List visible subdirectories of the kb (blocking).
+
+    scandir gets the entry type from the directory read itself, so there is
+    no stat per entry.
+    """
+    with os.scandir(kb_path) as it:
+        return sorted([
+            entry.name for entry in it if not entry.name.startswith(".") and entry.is_dir()
+        ])
+
+
+def _grep_file_sync(
+    file_path: Path, pattern: str, context_lines: int, max_matches: int
+) -> list[GrepMatch]:
+    """Search one file (blocking); large files are scanned through mmap.
+
+    Smaller files are first checked as a whole with the bytes prefilter, so
+    a file without any candidate is never decoded or split into lines.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_GREP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _grep_mmap(mm, pattern, context_lines, max_matches)
+        if _case_insensitive_bytes_pattern(pattern).search(f.read()) is None:
+            return []
+        f.seek(0)
+        all_lines = [line.rstrip("\n") for line in io.TextIOWrapper(f, encoding="utf-8")]
+
+    matches: list[GrepMatch] = []
+    pattern_lower = pattern.lower()
+
+    for i, line in enumerate(all_lines):
+        if pattern_lower in line.lower():
+            if len(matches) >= max_matches:
+                break
+
+            if not context_lines:
+                matches.append(
+                    GrepMatch(line_num=i + 1, context=[ContextLine(i + 1, line, True)])
+                )
+                continue
+
+            # Collect context
+            start = max(0, i - context_lines)
+            end = min(len(all_lines), i + context_lines + 1)
+            context = [
+                ContextLine(j + 1, all_lines[j], j == i) for j in range(start, end)
+            ]
+            matches.append(GrepMatch(line_num=i + 1, context=context))
+
+    return matches
+
+
+# Cased characters all sit in the first two planes; the rest have no case
+_CASED_LIMIT = 0x20000
+
+
+@lru_cache(maxsize=1)
+def _lowercase_sources() -> tuple[dict[str, list[str]], dict[str, str]]:
+    """Invert ``str.lower`` over every cased character.
+
+    Returns:
+        Tuple of (single, multi): ``single[x]`` lists the characters whose
+        lowercase form is ``x`` (e.g. "K", "k" and the Kelvin sign for "k");
+        ``multi`` maps characters whose lowercase form is longer than one
+        character (only "İ" -> "i̇") to that form
+    """
+    single: dict[str, list[str]] = {}
+    multi: dict[str, str] = {}
+    for ch in map(chr, range(_CASED_LIMIT)):
+        low = ch.lower()
+        if low == ch:
+            continue
+        if len(low) == 1:
+            single.setdefault(low, []).append(ch)
+        else:
+            multi[ch] = low
+    return single, multi
+
+
+@lru_cache(maxsize=64)
+def _case_insensitive_bytes_pattern(pattern: str) -> re.Pattern[bytes]:
+    """Build a bytes regex for the UTF-8 text whose ``str.lower`` contains pattern.lower().
+
+    Matches a superset of what the line scan accepts, so it can rule files
+    and lines out but every hit must still be confirmed. Compiled with re2
+    when installed: the pattern is a plain alternation of literals, which
+    its DFA scans several times faster than re's backtracker.
+    """
+    single, multi = _lowercase_sources()
+
+    def variants(ch: str) -> bytes:
+        # Characters lowering to several chars may also cover just one of
+        # them at either end of the pattern
+        chars = {ch, *single.get(ch, ()), *(m for m, low in multi.items() if ch in low)}
+        return b"(?:" + b"|".join(re.escape(c.encode()) for c in sorted(chars)) + b")"
+
+    target = pattern.lower()
+    parts = []
+    i = 0
+    while i < len(target):
+        whole = next((m for m, low in multi.items() if target.startswith(low, i)), None)
+        if whole is None:
+            parts.append(variants(target[i]))
+            i += 1
+            continue
+        # e.g. "i̇" is either "İ" or "i" followed by a combining dot
+        low = multi[whole]
+        run = b"".join(variants(c) for c in low)
+        parts.append(b"(?:" + re.escape(whole.encode()) + b"|" + run + b")")
+        i += len(low)
+    return _regex.compile(b"".join(parts))
+
+
+def _decode_line(raw: bytes) -> str:
+    return raw.decode("utf-8").rstrip("\r")
+
+
+def _grep_mmap(
+    mm: mmap.mmap, pattern: str, context_lines: int, max_matches: int
+) -> list[GrepMatch]:
+    """Scan a mapped file for candidates, then confirm per line.
+
+    The bytes regex accepts every line the ``str.lower`` test accepts, and
+    possibly more; each candidate line is decoded and confirmed with that
+    same test, so results match the in-memory path. An empty pattern
+    matches every line there too.
+    """
+    matches: list[GrepMatch] = []
+    needle = _case_insensitive_bytes_pattern(pattern)
+    pattern_lower = pattern.lower()
+    size = len(mm)
+    line_num = 1  # line number at byte offset `counted`
+    counted = 0
+    pos = 0
+
+    # pos == size only after a trailing newline: there is no line left
+    while pos < size and len(matches) < max_matches:
+        found = needle.search(mm, pos)
+        if found is None:
+            break
+
+        line_start = mm.rfind(b"\n", 0, found.start()) + 1
+        line_end = mm.find(b"\n", found.start())
+        if line_end == -1:
+            line_end = size
+        line_num += mm[counted:line_start].count(b"\n")
+        counted = line_start
+        pos = line_end + 1
+
+        text = _decode_line(mm[line_start:line_end])
+        if pattern_lower not in text.lower():
+            continue
+
+        if not context_lines:
+            matches.append(
+                GrepMatch(line_num=line_num, context=[ContextLine(line_num, text, True)])
+            )
+            continue
+
+        # Walk backwards / forwards for context lines
+        before: list[str] = []
+        cursor = line_start
+        while len(before) < context_lines and cursor > 0:
+            prev_start = mm.rfind(b"\n", 0, cursor - 1) + 1
+            before.append(_decode_line(mm[prev_start : cursor - 1]))
+            cursor = prev_start
+        before.reverse()
+
+        after: list[str] = []
+        cursor = line_end + 1
+        while len(after) < context_lines and cursor < size:
+            next_end = mm.find(b"\n", cursor)
+            if next_end == -1:
+                next_end = size
+            after.append(_decode_line(mm[cursor:next_end]))
+            cursor = next_end + 1
+
+        first = line_num - len(before)
+        context = [
+            ContextLine(first + k, t, k == len(before))
+            for k, t in enumerate([*before, text, *after])
+        ]
+        matches.append(GrepMatch(line_num=line_num, context=context))
+
+    return matches
+
+
 class KBService:
     """Service for knowledge base file operations."""
 
@@ -37,21 +267,48 @@ class KBService:
     async def list_categories(self) -> list[Category]:
         """List all categories in the knowledge base.
 
+        Directory listings and line counts are cached and revalidated by
+        mtime, so an unchanged knowledge base costs one stat per entry.
+
         Returns:
             List of categories sorted by name
         """
-        categories: list[Category] = []
+        try:
+            kb_mtime = (await aiofiles.os.stat(self.kb_path)).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = _category_names_cache.get(self.kb_path)
+        if cached is not None and cached[0] == kb_mtime:
+            names = cached[1]
+        else:
+            names = await asyncio.to_thread(_list_category_names_sync, self.kb_path)
+            _category_names_cache[self.kb_path] = (kb_mtime, names)
+
+        return [
+            Category(name=name, materials=await self._list_materials(self.kb_path / name))
+            for name in names
+        ]
 
-        if not await aiofiles.os.path.exists(self.kb_path):
-            return categories
+    async def get_category(self, category: str) -> Category | None:
+        """Get a single category without listing the others.
 
-        for entry in await aiofiles.os.listdir(self.kb_path):
-            entry_path = self.kb_path / entry
-            if await aiofiles.os.path.isdir(entry_path) and not entry.startswith("."):
-                materials = await self._list_materials(entry_path)
-                categories.append(Category(name=entry, materials=materials))
+        Args:
+            category: Category name
 
-        return sorted(categories, key=lambda c: c.name)
+        Returns:
+            The category with its materials, or None if it doesn't exist or
+            isn't a name list_categories() could return
+        """
+        # Same visibility rules as list_categories: one plain, non-hidden
+        # component directly under kb_path
+        if not category or category.startswith(".") or "/" in category or "\\" in category:
+            return None
+        try:
+            materials = await self._list_materials(self.kb_path / category)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return Category(name=category, materials=materials)
 
     async def _list_materials(self, category_path: Path) -> list[Material]:
         """List all materials in a category.
@@ -62,26 +319,34 @@ class KBService:
         Returns:
             List of materials
         """
+        dir_mtime = (await aiofiles.os.stat(category_path)).st_mtime_ns
+        cached = _dir_listing_cache.get(category_path)
+        if cached is not None and cached[0] == dir_mtime:
+            entries = cached[1]
+        else:
+            entries = frozenset(await aiofiles.os.listdir(category_path))
+            _dir_listing_cache[category_path] = (dir_mtime, entries)
+
         materials: list[Material] = []
 
-        for entry in await aiofiles.os.listdir(category_path):
+        for entry in sorted(entries):
             if entry.endswith(".md") and not entry.endswith("_index.md"):
-                file_path = category_path / entry
-                line_count = await self._count_lines(file_path)
-                has_index = await self._check_index_exists(category_path, entry)
-
+                stem = entry.replace(".md", "")
                 materials.append(
                     Material(
                         name=entry,  # Keep full filename with .md extension
-                        line_count=line_count,
-                        has_index=has_index,
+                        line_count=await self._count_lines(category_path / entry),
+                        # CSV 优先，MD 回退
+                        has_index=(
+                            f"{stem}_index.csv" in entries or f"{stem}_index.md" in entries
+                        ),
                     )
                 )
 
-        return sorted(materials, key=lambda m: m.name)
+        return materials
 
     async def _count_lines(self, file_path: Path) -> int:
-        """Count the number of lines in a file using wc -l for speed.
+        """Count lines, reusing the cached count while mtime and size match.
 
         Args:
             file_path: Path to the file
@@ -89,6 +354,17 @@ class KBService:
         Returns:
             Number of lines
         """
+        stat = await aiofiles.os.stat(file_path)
+        cached = _line_count_cache.get(file_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        count = await self._count_lines_uncached(file_path)
+        _line_count_cache[file_path] = (stat.st_mtime_ns, stat.st_size, count)
+        return count
+
+    async def _count_lines_uncached(self, file_path: Path) -> int:
+        """Count the number of lines in a file using wc -l for speed."""
         try:
             # Use wc -l for fast line counting (much faster than reading file in Python)
             result = subprocess.run(
@@ -110,24 +386,6 @@ class KBService:
                 count += 1
         return count
 
-    async def _check_index_exists(self, category_path: Path, material_name: str) -> bool:
-        """Check if an index file exists for a material.
-
-        Args:
-            category_path: Path to the category directory
-            material_name: Name of the material file (with .md extension)
-
-        Returns:
-            True if index file exists
-        """
-        stem = material_name.replace(".md", "")
-        # CSV 优先，MD 回退
-        csv_path = category_path / f"{stem}_index.csv"
-        if await aiofiles.os.path.exists(csv_path):
-            return True
-        md_path = category_path / f"{stem}_index.md"
-        return await aiofiles.os.path.exists(md_path)
-
     async def read_file_range(
         self,
         category: str,
@@ -156,25 +414,17 @@ class KBService:
 
         file_path = self.kb_path / category / material
 
-        if not await aiofiles.os.path.exists(file_path):
-            raise FileNotFoundError(f"Material not found: {category}/{material}")
-
-        lines: list[tuple[int, str]] = []
         truncated = False
         actual_end = min(end_line, start_line + max_lines - 1)
 
         if end_line - start_line + 1 > max_lines:
             truncated = True
 
-        line_num = 0
-        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-            async for line in f:
-                line_num += 1
-                if line_num < start_line:
-                    continue
-                if line_num > actual_end:
-                    break
-                lines.append((line_num, line.rstrip("\n")))
+        # Large files seek via the side-car line index instead of rescanning
+        try:
+            lines = await asyncio.to_thread(read_lines, file_path, start_line, actual_end)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Material not found: {category}/{material}") from None
 
         return lines, truncated
 
@@ -189,21 +439,7 @@ class KBService:
             Index file content, or None if not found
         """
         stem = material.replace(".md", "")
-        category_path = self.kb_path / category
-
-        # CSV 优先
-        csv_path = category_path / f"{stem}_index.csv"
-        if await aiofiles.os.path.exists(csv_path):
-            async with aiofiles.open(csv_path, "r", encoding="utf-8") as f:
-                return await f.read()
-
-        # MD 回退
-        md_path = category_path / f"{stem}_index.md"
-        if await aiofiles.os.path.exists(md_path):
-            async with aiofiles.open(md_path, "r", encoding="utf-8") as f:
-                return await f.read()
-
-        return None
+        return await asyncio.to_thread(_read_index_sync, self.kb_path / category, stem)
 
     async def grep(
         self,
@@ -233,43 +469,57 @@ class KBService:
 
         category_path = self.kb_path / category
 
-        if not await aiofiles.os.path.exists(category_path):
-            return results
-
         if material:
             # Search single file
             file_path = category_path / material
-            if await aiofiles.os.path.exists(file_path):
+            try:
                 matches = await self._grep_file(file_path, pattern, context_lines, max_matches)
+            except FileNotFoundError:
+                matches = []
+            if matches:
+                results.append(
+                    GrepResult(
+                        material=material,
+                        matches=matches,
+                        total_matches=len(matches),
+                    )
+                )
+        else:
+            # Search all files in category
+            try:
+                entries = sorted(await aiofiles.os.listdir(category_path))
+            except FileNotFoundError:
+                return results
+
+            materials = [
+                entry
+                for entry in entries
+                if entry.endswith(".md") and not entry.endswith("_index.md")
+            ]
+
+            # 各文件并发扫描（线程池限制并发数），再按文件名顺序分配匹配额度；
+            # 每个文件的前 N 个匹配与顺序扫描时完全一致
+            per_file = await asyncio.gather(
+                *(
+                    self._grep_file(category_path / entry, pattern, context_lines, max_matches)
+                    for entry in materials
+                )
+            )
+
+            for entry, matches in zip(materials, per_file, strict=True):
+                remaining = max_matches - total_found
+                if remaining <= 0:
+                    break
+                matches = matches[:remaining]
                 if matches:
                     results.append(
                         GrepResult(
-                            material=material,
+                            material=entry,  # Keep full filename with .md
                             matches=matches,
                             total_matches=len(matches),
                         )
                     )
-        else:
-            # Search all files in category
-            for entry in sorted(await aiofiles.os.listdir(category_path)):
-                if entry.endswith(".md") and not entry.endswith("_index.md"):
-                    file_path = category_path / entry
-                    remaining = max_matches - total_found
-                    if remaining <= 0:
-                        break
-
-                    matches = await self._grep_file(
-                        file_path, pattern, context_lines, remaining
-                    )
-                    if matches:
-                        results.append(
-                            GrepResult(
-                                material=entry,  # Keep full filename with .md
-                                matches=matches,
-                                total_matches=len(matches),
-                            )
-                        )
-                        total_found += len(matches)
+                    total_found += len(matches)
 
         return results
 
@@ -291,34 +541,9 @@ class KBService:
         Returns:
             List of GrepMatch objects
         """
-        matches: list[GrepMatch] = []
-        all_lines: list[str] = []
-
-        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-            async for line in f:
-                all_lines.append(line.rstrip("\n"))
-
-        pattern_lower = pattern.lower()
-
-        for i, line in enumerate(all_lines):
-            if pattern_lower in line.lower():
-                if len(matches) >= max_matches:
-                    break
-
-                # Collect context
-                start = max(0, i - context_lines)
-                end = min(len(all_lines), i + context_lines + 1)
-                context: list[dict[str, int | str | bool]] = [
-                    {
-                        "line_num": j + 1,
-                        "text": all_lines[j],
-                        "is_match": j == i,
-                    }
-                    for j in range(start, end)
-                ]
-                matches.append(GrepMatch(line_num=i + 1, context=context))
-
-        return matches
+        return await asyncio.to_thread(
+            _grep_file_sync, file_path, pattern, context_lines, max_matches
+        )
 
     async def category_exists(self, category: str) -> bool:
         """Check if a category exists.
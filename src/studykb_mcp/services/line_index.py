@@ -0,0 +1,159 @@
+"""Persistent line-offset index for large material files.
+
+Maps every ``STRIDE``-th line to its byte offset so that range reads can
+seek close to ``start_line`` instead of scanning from the top of the file.
+Files above ``SED_MIN_BYTES`` skip the index and are filtered by ``sed``.
+
+Storage layout (hidden side-car next to the material):
+    kb/{category}/.{material}.lineidx   # JSON: mtime_ns, size, stride, offsets
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import cast
+
+STRIDE = 1024  # lines between checkpoints
+_CHUNK_SIZE = 1 << 20
+SED_MIN_BYTES = 32 * 1024 * 1024  # above this, hand line filtering to sed
+
+
+def _index_path(file_path: Path) -> Path:
+    return file_path.with_name(f".{file_path.name}.lineidx")
+
+
+def _build_offsets(file_path: Path) -> list[int]:
+    """Scan the file once and record the byte offset of every STRIDE-th line.
+
+    ``offsets[k]`` is the offset where line ``k * STRIDE + 1`` starts.
+    """
+    offsets = [0]
+    line_count = 0
+    base = 0
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            pos = chunk.find(b"\n")
+            while pos != -1:
+                line_count += 1
+                if line_count % STRIDE == 0:
+                    offsets.append(base + pos + 1)
+                pos = chunk.find(b"\n", pos + 1)
+            base += len(chunk)
+    return offsets
+
+
+def load_offsets(file_path: Path) -> list[int]:
+    """Return checkpoint offsets for a file, rebuilding the side-car if stale.
+
+    Blocking; call via ``asyncio.to_thread``.
+
+    Raises:
+        FileNotFoundError: If the material file doesn't exist
+    """
+    stat = os.stat(file_path)
+    index_path = _index_path(file_path)
+
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if (
+            isinstance(data, dict)
+            and data.get("mtime_ns") == stat.st_mtime_ns
+            and data.get("size") == stat.st_size
+            and data.get("stride") == STRIDE
+        ):
+            cached = data.get("offsets")
+            # A hand-edited or truncated side-car falls through to a rebuild
+            if (
+                isinstance(cached, list)
+                and cached
+                and all(type(o) is int and 0 <= o <= stat.st_size for o in cached)
+                and cached[0] == 0
+            ):
+                return cast(list[int], cached)
+    except (OSError, ValueError):
+        pass
+
+    offsets = _build_offsets(file_path)
+
+    # Persist atomically; a read-only kb just means no caching
+    tmp = index_path.with_name(f"{index_path.name}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "stride": STRIDE,
+                    "offsets": offsets,
+                },
+                f,
+            )
+        os.replace(tmp, index_path)
+    except OSError:
+        pass
+
+    return offsets
+
+
+def _read_lines_sed(
+    file_path: Path, start_line: int, end_line: int
+) -> list[tuple[int, str]] | None:
+    """Let sed do the line filtering; returns None if sed is unavailable."""
+    try:
+        result = subprocess.run(
+            ["sed", "-n", f"{start_line},{end_line}p;{end_line}q", str(file_path)],
+            capture_output=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+
+    rows = result.stdout.split(b"\n")
+    if rows and rows[-1] == b"":
+        rows.pop()
+    return [
+        (line_num, raw.decode("utf-8").rstrip("\r"))
+        for line_num, raw in zip(range(start_line, end_line + 1), rows, strict=False)
+    ]
+
+
+def read_lines(file_path: Path, start_line: int, end_line: int) -> list[tuple[int, str]]:
+    """Read lines ``start_line..end_line`` (1-based, inclusive).
+
+    Small offsets are read by scanning from the top; beyond the first
+    checkpoint the side-car index is used to seek near ``start_line``.
+    Huge files are filtered by sed so Python never iterates their lines.
+    Blocking; call via ``asyncio.to_thread``.
+
+    Raises:
+        FileNotFoundError: If the material file doesn't exist
+    """
+    if start_line > end_line:
+        return []
+
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= SED_MIN_BYTES:
+            sed_lines = _read_lines_sed(file_path, start_line, end_line)
+            if sed_lines is not None:
+                return sed_lines
+
+        line_num = 0
+        if start_line > STRIDE:
+            offsets = load_offsets(file_path)
+            checkpoint = min((start_line - 1) // STRIDE, len(offsets) - 1)
+            f.seek(offsets[checkpoint])
+            line_num = checkpoint * STRIDE
+
+        lines: list[tuple[int, str]] = []
+        for raw in f:
+            line_num += 1
+            if line_num < start_line:
+                continue
+            if line_num > end_line:
+                break
+            lines.append((line_num, raw.decode("utf-8").rstrip("\r\n")))
+    return lines
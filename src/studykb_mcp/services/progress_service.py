@@ -1,21 +1,252 @@
 """Progress tracking service."""
 
 import asyncio
+import heapq
 import json
-from collections import defaultdict
+import os
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from types import ModuleType
+from typing import Any, BinaryIO, Literal
 
-import aiofiles
 import aiofiles.os
 
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # optional, see the "fast" extra
+    ijson = None
+
 from ..config import settings
 from ..models.progress import ProgressEntry, ProgressFile, ProgressStatus, RelatedSection
 from .review_service import ReviewService
 
 # 全局锁字典，按 category 隔离，确保同一 category 的写操作串行化
-_category_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+# 弱引用：无人持有或等待时自动回收，避免锁数量随分类无限增长
+_category_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+# 'since' filter values -> days; "all" and unknown values mean no cutoff
+_SINCE_DAYS = {"7d": 7, "30d": 30, "90d": 90}
+
+
+@lru_cache(maxsize=4)
+def _review_service_for(
+    initial_interval: float, multiplier: float, max_interval: float
+) -> ReviewService:
+    # The intervals are only part of the key: ReviewService copies them
+    # from settings when constructed
+    return ReviewService()
+
+
+def _get_review_service() -> ReviewService:
+    """Shared ReviewService, rebuilt only when the review settings change."""
+    return _review_service_for(
+        settings.review_initial_interval,
+        settings.review_multiplier,
+        settings.review_max_interval,
+    )
+
+
+def _updated_at_key(item: tuple[str, ProgressEntry]) -> datetime:
+    """Sort key for (entry_id, entry) pairs."""
+    return item[1].updated_at
+
+
+def _lock_for(category: str) -> asyncio.Lock:
+    """Return the category's lock; callers keep it alive while they use it."""
+    lock = _category_locks.get(category)
+    if lock is None:
+        lock = asyncio.Lock()
+        _category_locks[category] = lock
+    return lock
+
+# Single-entry changes are appended to {category}.log.jsonl instead of
+# rewriting {category}.json; the log is folded back into the snapshot once
+# it outgrows both the floor and LOG_COMPACT_RATIO x the snapshot size.
+LOG_COMPACT_MIN_BYTES = 64 * 1024
+LOG_COMPACT_RATIO = 2
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Snapshots at least this large are parsed entry by entry (needs ijson)
+STREAM_PARSE_MIN_BYTES = 1024 * 1024
+
+# Adaptive group commit: a lone change is flushed right away; a burst waits
+# 1 ms per 4 queued changes (up to FLUSH_MAX_DELAY) for follow-ons to join
+FLUSH_MAX_DELAY = 0.005
+
+
+def _snapshot_id(stat: os.stat_result) -> str:
+    """Identify a snapshot version; the log header pins the one it extends."""
+    return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _disk_key_sync(snapshot_path: Path, log_path: Path) -> tuple[str, int] | None:
+    """Return (snapshot id, log size) describing what is on disk, or None."""
+    try:
+        snapshot_stat = os.stat(snapshot_path)
+    except FileNotFoundError:
+        return None
+    try:
+        log_size = os.stat(log_path).st_size
+    except FileNotFoundError:
+        log_size = 0
+    return _snapshot_id(snapshot_stat), log_size
+
+
+def _stream_progress_file(f: BinaryIO) -> ProgressFile:
+    """Parse a snapshot one entry at a time instead of building the whole tree."""
+    fields: dict[str, Any] = {}
+    entries: dict[str, ProgressEntry] = {}
+    builder: Any = None
+    entry_id = entry_prefix = ""
+
+    for prefix, event, value in ijson.parse(f):
+        if builder is not None:
+            builder.event(event, value)
+            if event == "end_map" and prefix == entry_prefix:
+                entries[entry_id] = ProgressEntry.model_validate(builder.value)
+                builder = None
+        elif prefix == "entries" and event == "map_key":
+            entry_id, entry_prefix = value, f"entries.{value}"
+            builder = ijson.ObjectBuilder()
+        elif prefix in ("category", "last_updated"):
+            fields[prefix] = value
+
+    return ProgressFile.model_validate({**fields, "entries": entries})
+
+
+def _read_progress_sync(
+    snapshot_path: Path, log_path: Path
+) -> tuple[str, ProgressFile, bytes] | None:
+    """Read and parse snapshot and change log in a single worker-thread hop.
+
+    Returns:
+        Tuple of (snapshot id, parsed snapshot, raw log), or None if there
+        is no snapshot
+    """
+    try:
+        with open(snapshot_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if ijson is not None and stat.st_size >= STREAM_PARSE_MIN_BYTES:
+                progress_file = _stream_progress_file(f)
+            else:
+                # pydantic-core parses straight into the model, no dict in between
+                progress_file = ProgressFile.model_validate_json(f.read())
+    except FileNotFoundError:
+        return None
+    try:
+        with open(log_path, "rb") as f:
+            log_data = f.read()
+    except FileNotFoundError:
+        log_data = b""
+    return _snapshot_id(stat), progress_file, log_data
+
+
+def _save_snapshot_sync(snapshot_path: Path, log_path: Path, content: str) -> str:
+    """Atomically replace the snapshot and drop the log it supersedes.
+
+    Returns:
+        Snapshot id of the written file (taken before the rename, which
+        keeps inode and mtime, so callers need not stat it again)
+    """
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+        snapshot_id = _snapshot_id(os.fstat(f.fileno()))
+    os.replace(temp_path, snapshot_path)
+
+    # The snapshot now contains everything the log recorded
+    try:
+        os.remove(log_path)
+    except FileNotFoundError:
+        pass
+    return snapshot_id
+
+
+def _append_log_sync(
+    snapshot_path: Path, log_path: Path, text: str
+) -> tuple[str, int, int]:
+    """Append records (resetting a log left over from another snapshot).
+
+    Returns:
+        Tuple of (snapshot id, snapshot size, log size after the append)
+
+    Raises:
+        FileNotFoundError: If there is no snapshot to extend
+    """
+    snapshot_stat = os.stat(snapshot_path)
+    snapshot_id = _snapshot_id(snapshot_stat)
+    with open(log_path, "a+", encoding="utf-8") as f:
+        f.seek(0)
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not header or header.get("snapshot") != snapshot_id:
+            f.truncate(0)
+            f.write(json.dumps({"op": "base", "snapshot": snapshot_id}) + "\n")
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+        return snapshot_id, snapshot_stat.st_size, os.fstat(f.fileno()).st_size
+
+
+def _apply_log_record(progress_file: ProgressFile, record: dict) -> None:
+    if record["op"] == "put":
+        progress_file.put_entry(record["id"], ProgressEntry.model_validate(record["entry"]))
+    elif record["op"] == "delete":
+        progress_file.pop_entry(record["id"])
+    progress_file.last_updated = datetime.fromisoformat(record["last_updated"])
+
+
+@dataclass
+class _CategoryState:
+    """In-memory copy of a category shared by all ProgressService instances.
+
+    Entries are never mutated in place (changes swap in new ProgressEntry
+    objects), so readers only need a shallow copy of the entries dict.
+    """
+
+    progress_file: ProgressFile
+    disk_key: tuple[str, int] | None  # (snapshot id, log size) the copy reflects
+    pending: list[str] = field(default_factory=list)  # log lines not yet written
+    flushed: asyncio.Future | None = None  # resolves when pending work is on disk
+    flush_task: asyncio.Task | None = None
+    write_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def busy(self) -> bool:
+        """Memory is ahead of disk while our own writes are in flight."""
+        return self.flushed is not None or self.write_lock.locked()
+
+
+# 按快照路径缓存的分类状态；读操作命中时无需访问磁盘
+# (insertion order doubles as LRU order, trimmed to PROGRESS_CACHE_SIZE)
+_states: dict[Path, _CategoryState] = {}
+PROGRESS_CACHE_SIZE = 64
+
+
+def _remember_state(snapshot_path: Path, state: _CategoryState) -> None:
+    """Install a state as most recently used, evicting idle old ones."""
+    _states.pop(snapshot_path, None)
+    _states[snapshot_path] = state
+    if len(_states) > PROGRESS_CACHE_SIZE:
+        for path in [p for p, s in _states.items() if not s.busy]:
+            if len(_states) <= PROGRESS_CACHE_SIZE:
+                break
+            del _states[path]
 
 
 class ProgressService:
@@ -23,7 +254,7 @@ class ProgressService:
 
     def __init__(self, progress_path: Path | None = None) -> None:
         self.progress_path = progress_path or settings.progress_path
-        self.review_service = ReviewService()
+        self.review_service = _get_review_service()
 
     async def get_progress(
         self,
@@ -45,23 +276,51 @@ class ProgressService:
         Returns:
             ProgressFile with filtered entries
         """
-        progress_file = await self._load_progress_file(category)
-
-        # Auto-check and update done -> review transitions
-        updated = self._check_review_triggers(progress_file)
-        if updated:
-            await self._save_progress_file(category, progress_file)
+        progress_file = (await self._get_reviewed_state(category)).progress_file
 
         # Apply filters
-        filtered_entries = self._filter_entries(
-            progress_file.entries, status_filter, since, limit
-        )
+        groups = self._filter_entries(progress_file.entries, status_filter, since, limit)
 
-        return ProgressFile(
-            category=category,
-            last_updated=progress_file.last_updated,
-            entries=filtered_entries,
-        )
+        # The groups are already ordered; formatters reuse them unsorted
+        return ProgressFile.from_status_groups(category, progress_file.last_updated, groups)
+
+    async def get_multi_stats(self, categories: list[str]) -> dict[str, dict[str, int]]:
+        """Get statistics for several categories, loading them concurrently.
+
+        Like get_progress, due done -> review transitions are applied first.
+
+        Args:
+            categories: Category names
+
+        Returns:
+            Mapping of category name to ProgressFile.get_stats() counts
+        """
+        states = await asyncio.gather(*(self._get_reviewed_state(c) for c in categories))
+        return {
+            category: state.progress_file.get_stats()
+            for category, state in zip(categories, states, strict=True)
+        }
+
+    async def _get_reviewed_state(self, category: str) -> _CategoryState:
+        """Get the shared state after applying due done -> review transitions."""
+        state = await self._get_state(category)
+
+        # Re-checked under the lock on the shared state: readers that raced
+        # the first one find nothing left to change and write nothing.
+        if self._has_due_reviews(state.progress_file):
+            flushed = None
+            async with _lock_for(category):
+                state = await self._get_state(category)
+                updated_ids = self._check_review_triggers(state.progress_file)
+                if updated_ids:
+                    flushed = self._submit(
+                        category,
+                        state,
+                        [self._put_record(state.progress_file, i) for i in updated_ids],
+                    )
+            if flushed is not None:
+                await flushed
+        return state
 
     async def get_full_progress(self, category: str) -> ProgressFile:
         """Get full progress data for a category without filtering.
@@ -86,7 +345,9 @@ class ProgressService:
         """Create or update a progress entry.
 
         Uses per-category locking to prevent concurrent write conflicts
-        when batch_call executes multiple updates in parallel.
+        when batch_call executes multiple updates in parallel. The lock only
+        covers the in-memory change; the write is queued and awaited after
+        release, so concurrent updates share one flush.
 
         Args:
             category: Category name
@@ -102,52 +363,132 @@ class ProgressService:
         Raises:
             ValueError: If name is not provided for new entries
         """
+        # 锁外预热缓存，锁内只做内存修改并提交写入
+        await self._get_state(category)
+
         # 使用 category 级别的锁，确保同一 category 的写操作串行化
-        async with _category_locks[category]:
-            progress_file = await self._load_progress_file(category)
+        async with _lock_for(category):
+            state = await self._get_state(category)
+            progress_file = state.progress_file
 
-            is_new = progress_id not in progress_file.entries
+            existing = progress_file.entries.get(progress_id)
             now = datetime.now()
-            old_status: ProgressStatus | None = None
-
-            if is_new:
-                if not name:
-                    raise ValueError("name is required for new progress entry")
-                entry = ProgressEntry(
-                    name=name,
-                    status=status,
-                    comment=comment,
-                    updated_at=now,
-                    mastered_at=now if status == "done" else None,
-                    review_count=0,
-                    next_review_at=(
-                        self.review_service.calculate_next_review(now, 0)
-                        if status == "done"
-                        else None
-                    ),
-                    related_sections=related_sections or [],
+            entry = self._build_entry(existing, status, name, comment, related_sections, now)
+            is_new = existing is None
+            old_status = existing.status if existing is not None else None
+
+            progress_file.put_entry(progress_id, entry)
+            progress_file.last_updated = now
+
+            flushed = self._submit(
+                category, state, [self._put_record(progress_file, progress_id)]
+            )
+
+        await flushed
+        return entry, is_new, old_status
+
+    async def update_progress_many(
+        self, category: str, updates: list[dict[str, Any]]
+    ) -> list[tuple[ProgressEntry, bool, ProgressStatus | None]]:
+        """Create or update several entries of one category at once.
+
+        Takes the category lock once and queues every record for a single
+        flush. If any update is invalid, none of them is applied.
+
+        Args:
+            category: Category name
+            updates: Keyword arguments of update_progress, one dict per
+                update (progress_id, status, optional name, comment,
+                related_sections)
+
+        Returns:
+            List of (entry, is_new, old_status), in the order of updates
+
+        Raises:
+            ValueError: If name is not provided for a new entry
+        """
+        if not updates:
+            return []
+
+        await self._get_state(category)
+
+        async with _lock_for(category):
+            state = await self._get_state(category)
+            progress_file = state.progress_file
+            now = datetime.now()
+
+            staged: dict[str, ProgressEntry] = {}
+            results: list[tuple[ProgressEntry, bool, ProgressStatus | None]] = []
+            for update in updates:
+                progress_id = update["progress_id"]
+                existing = staged.get(progress_id) or progress_file.entries.get(progress_id)
+                entry = self._build_entry(
+                    existing,
+                    update["status"],
+                    update.get("name"),
+                    update.get("comment", ""),
+                    update.get("related_sections"),
+                    now,
                 )
-            else:
-                existing = progress_file.entries[progress_id]
-                old_status = existing.status
-
-                entry = ProgressEntry(
-                    name=name or existing.name,
-                    status=status,
-                    comment=comment,
-                    updated_at=now,
-                    mastered_at=self._update_mastered_at(existing, old_status, status, now),
-                    review_count=self._update_review_count(existing, old_status, status),
-                    next_review_at=self._update_next_review(existing, old_status, status, now),
-                    related_sections=related_sections if related_sections is not None else existing.related_sections,
+                staged[progress_id] = entry
+                results.append(
+                    (entry, existing is None, existing.status if existing is not None else None)
                 )
 
-            progress_file.entries[progress_id] = entry
             progress_file.last_updated = now
+            for progress_id, entry in staged.items():
+                progress_file.put_entry(progress_id, entry)
 
-            await self._save_progress_file(category, progress_file)
+            flushed = self._submit(
+                category, state, [self._put_record(progress_file, i) for i in staged]
+            )
 
-            return entry, is_new, old_status
+        await flushed
+        return results
+
+    def _build_entry(
+        self,
+        existing: ProgressEntry | None,
+        status: ProgressStatus,
+        name: str | None,
+        comment: str,
+        related_sections: list[RelatedSection] | None,
+        now: datetime,
+    ) -> ProgressEntry:
+        """Build the new version of an entry (a fresh one if existing is None).
+
+        Raises:
+            ValueError: If name is not provided for a new entry
+        """
+        if existing is None:
+            if not name:
+                raise ValueError("name is required for new progress entry")
+            return ProgressEntry(
+                name=name,
+                status=status,
+                comment=comment,
+                updated_at=now,
+                mastered_at=now if status == "done" else None,
+                review_count=0,
+                next_review_at=(
+                    self.review_service.calculate_next_review(now, 0)
+                    if status == "done"
+                    else None
+                ),
+                related_sections=related_sections or [],
+            )
+
+        old_status = existing.status
+        return ProgressEntry(
+            name=name or existing.name,
+            status=status,
+            comment=comment,
+            updated_at=now,
+            mastered_at=self._update_mastered_at(existing, old_status, status, now),
+            review_count=self._update_review_count(existing, old_status, status),
+            next_review_at=self._update_next_review(existing, old_status, status, now),
+            related_sections=related_sections if related_sections is not None else existing.related_sections,
+        )
 
     def _update_mastered_at(
         self,
@@ -190,25 +531,32 @@ class ProgressService:
 
         return self.review_service.calculate_next_review(now, review_count)
 
-    def _check_review_triggers(self, progress_file: ProgressFile) -> bool:
+    def _has_due_reviews(self, progress_file: ProgressFile) -> bool:
+        """Check whether any done entry has reached its review time."""
+        return progress_file.reviews_may_be_due(datetime.now())
+
+    def _check_review_triggers(self, progress_file: ProgressFile) -> list[str]:
         """Check and trigger done -> review transitions.
 
         Args:
             progress_file: Progress file to check
 
         Returns:
-            True if any entries were updated
+            IDs of the entries that were updated
         """
         now = datetime.now()
-        updated = False
-
-        for entry in progress_file.entries.values():
-            if entry.status == "done" and entry.next_review_at:
-                if now >= entry.next_review_at:
-                    entry.status = "review"
-                    entry.updated_at = now
-                    updated = True
+        updated = progress_file.pop_due_reviews(now)
+
+        for entry_id in updated:
+            progress_file.put_entry(
+                entry_id,
+                progress_file.entries[entry_id].model_copy(
+                    update={"status": "review", "updated_at": now}
+                ),
+            )
 
+        if updated:
+            progress_file.last_updated = now
         return updated
 
     def _filter_entries(
@@ -217,7 +565,7 @@ class ProgressService:
         status_filter: list[ProgressStatus] | None,
         since: str,
         limit: int,
-    ) -> dict[str, ProgressEntry]:
+    ) -> dict[str, list[tuple[str, ProgressEntry]]]:
         """Apply filters to progress entries.
 
         Args:
@@ -227,40 +575,35 @@ class ProgressService:
             limit: Maximum entries per status group
 
         Returns:
-            Filtered entries
+            Filtered (entry_id, entry) pairs per requested status, newest
+            updated_at first
         """
-        result: dict[str, ProgressEntry] = {}
-
         # Parse time filter
         since_time = self._parse_since(since)
 
-        # Group by status
+        # Group by status, with buckets only for the requested statuses
         by_status: dict[str, list[tuple[str, ProgressEntry]]] = {
-            "active": [],
-            "review": [],
-            "done": [],
-            "pending": [],
+            status: []
+            for status in ("active", "review", "done", "pending")
+            if not status_filter or status in status_filter
         }
 
         for entry_id, entry in entries.items():
-            if since_time and entry.updated_at < since_time:
+            bucket = by_status.get(entry.status)
+            if bucket is None:
                 continue
-            if status_filter and entry.status not in status_filter:
+            if since_time and entry.updated_at < since_time:
                 continue
-            by_status[entry.status].append((entry_id, entry))
-
-        # Sort by updated_at (descending) and apply limit
-        for status in by_status:
-            by_status[status].sort(key=lambda x: x[1].updated_at, reverse=True)
+            bucket.append((entry_id, entry))
 
-            entries_to_include = by_status[status]
+        # Newest updated_at first; with a limit only the top K need ordering
+        for status, bucket in by_status.items():
             if limit > 0:
-                entries_to_include = entries_to_include[:limit]
-
-            for entry_id, entry in entries_to_include:
-                result[entry_id] = entry
+                by_status[status] = heapq.nlargest(limit, bucket, key=_updated_at_key)
+            else:
+                bucket.sort(key=_updated_at_key, reverse=True)
 
-        return result
+        return by_status
 
     def _parse_since(self, since: str) -> datetime | None:
         """Parse the 'since' parameter into a datetime.
@@ -271,14 +614,49 @@ class ProgressService:
         Returns:
             Datetime threshold, or None for "all"
         """
-        if since == "all":
-            return None
-
-        days = {"7d": 7, "30d": 30, "90d": 90}.get(since, 0)
+        days = _SINCE_DAYS.get(since)
         if days:
             return datetime.now() - timedelta(days=days)
         return None
 
+    def _snapshot_path(self, category: str) -> Path:
+        return self.progress_path / f"{category}.json"
+
+    def _log_path(self, category: str) -> Path:
+        return self.progress_path / f"{category}.log.jsonl"
+
+    async def _get_state(self, category: str) -> _CategoryState:
+        """Return the shared in-memory state, reloading only if the files changed.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Cached state for the category
+        """
+        snapshot_path = self._snapshot_path(category)
+        state = _states.get(snapshot_path)
+        if state is not None:
+            if state.busy:
+                return state
+            disk_key = await asyncio.to_thread(
+                _disk_key_sync, snapshot_path, self._log_path(category)
+            )
+            if disk_key == state.disk_key:
+                _remember_state(snapshot_path, state)
+                return state
+
+        progress_file, disk_key = await self._read_progress_file(category)
+
+        # Another task may have installed or started changing a state meanwhile
+        current = _states.get(snapshot_path)
+        if current is not None and (current is not state or current.busy):
+            return current
+
+        state = _CategoryState(progress_file=progress_file, disk_key=disk_key)
+        _remember_state(snapshot_path, state)
+        return state
+
     async def _load_progress_file(self, category: str) -> ProgressFile:
         """Load progress file for a category.
 
@@ -288,19 +666,137 @@ class ProgressService:
         Returns:
             ProgressFile (empty if file doesn't exist)
         """
-        file_path = self.progress_path / f"{category}.json"
+        state = await self._get_state(category)
+        return state.progress_file.snapshot()
+
+    async def _read_progress_file(
+        self, category: str
+    ) -> tuple[ProgressFile, tuple[str, int] | None]:
+        """Read a category from disk.
 
-        if not await aiofiles.os.path.exists(file_path):
-            return ProgressFile(
-                category=category,
-                last_updated=datetime.now(),
-                entries={},
+        Reads the JSON snapshot, then replays the change log on top of it.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Tuple of (progress file, disk key); the key is None (and the
+            progress file empty) if the file doesn't exist
+        """
+        result = await asyncio.to_thread(
+            _read_progress_sync, self._snapshot_path(category), self._log_path(category)
+        )
+        if result is None:
+            return (
+                ProgressFile(category=category, last_updated=datetime.now(), entries={}),
+                None,
             )
 
-        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-            data = json.loads(await f.read())
+        snapshot_id, progress_file, log_data = result
+        # A torn trailing append may end mid-character
+        self._replay_log(progress_file, snapshot_id, log_data.decode("utf-8", "replace"))
+        return progress_file, (snapshot_id, len(log_data))
+
+    def _replay_log(
+        self, progress_file: ProgressFile, snapshot_id: str, log_text: str
+    ) -> None:
+        """Apply logged changes made since the snapshot was written."""
+        lines = log_text.split("\n")
+        try:
+            header = json.loads(lines[0]) if lines[0] else None
+        except ValueError:
+            return
+        # A log written against another snapshot is already folded in (or
+        # was superseded by a full rewrite)
+        if not header or header.get("snapshot") != snapshot_id:
+            return
+
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                record = _json_loads(line)
+            except ValueError:
+                break  # torn trailing append
+            _apply_log_record(progress_file, record)
+
+    def _put_record(self, progress_file: ProgressFile, progress_id: str) -> str:
+        return json.dumps(
+            {
+                "op": "put",
+                "id": progress_id,
+                "entry": progress_file.entries[progress_id].model_dump(mode="json"),
+                "last_updated": progress_file.last_updated.isoformat(),
+            },
+            ensure_ascii=False,
+        ) + "\n"
+
+    def _submit(
+        self, category: str, state: _CategoryState, lines: list[str]
+    ) -> asyncio.Future:
+        """Queue log lines for the category writer.
+
+        Must be called under the category lock, right after the in-memory
+        change the lines describe.
 
-        return ProgressFile.model_validate(data)
+        Returns:
+            Future that resolves once the change is on disk
+        """
+        state.pending.extend(lines)
+        if state.flushed is None:
+            state.flushed = asyncio.get_running_loop().create_future()
+            state.flush_task = asyncio.create_task(self._flush(category, state))
+        return state.flushed
+
+    async def _flush(self, category: str, state: _CategoryState) -> None:
+        """Write everything queued for a category in one go."""
+        await asyncio.sleep(0)  # let changes submitted in the same tick join
+        delay = min(FLUSH_MAX_DELAY, len(state.pending) // 4 / 1000)
+        if delay:
+            await asyncio.sleep(delay)
+        async with state.write_lock:
+            flushed, state.flushed = state.flushed, None
+            # _submit() sets the future before it starts this task, and
+            # only this task clears it
+            assert flushed is not None
+            lines, state.pending = state.pending, []
+            try:
+                await self._write_changes(category, state, lines)
+            except Exception as e:
+                # Memory is now ahead of disk; make the next access reload
+                _states.pop(self._snapshot_path(category), None)
+                flushed.set_exception(e)
+            else:
+                flushed.set_result(None)
+
+    async def _write_changes(
+        self, category: str, state: _CategoryState, lines: list[str]
+    ) -> None:
+        """Persist queued changes by appending to the log.
+
+        Falls back to a full snapshot write when there is no snapshot yet,
+        and compacts once the log grows past its threshold.
+        """
+        snapshot_path = self._snapshot_path(category)
+        base_id = state.disk_key[0] if state.disk_key else None
+        try:
+            snapshot_id, snapshot_size, log_size = await asyncio.to_thread(
+                _append_log_sync, snapshot_path, self._log_path(category), "".join(lines)
+            )
+        except FileNotFoundError:
+            pass
+        else:
+            if snapshot_id != base_id:
+                # The snapshot was replaced behind our back; disk now holds
+                # its content plus our records, so reload on next access
+                _states.pop(snapshot_path, None)
+                return
+            if log_size <= max(LOG_COMPACT_MIN_BYTES, LOG_COMPACT_RATIO * snapshot_size):
+                state.disk_key = (snapshot_id, log_size)
+                return
+
+        snapshot_id = await self._save_progress_file(category, state.progress_file)
+        state.disk_key = (snapshot_id, 0)
 
     async def delete_progress(
         self, category: str, progress_id: str
@@ -316,38 +812,46 @@ class ProgressService:
         Returns:
             The deleted entry, or None if not found
         """
-        async with _category_locks[category]:
-            progress_file = await self._load_progress_file(category)
+        await self._get_state(category)
+
+        async with _lock_for(category):
+            state = await self._get_state(category)
+            progress_file = state.progress_file
 
-            if progress_id not in progress_file.entries:
+            deleted_entry = progress_file.pop_entry(progress_id)
+            if deleted_entry is None:
                 return None
 
-            deleted_entry = progress_file.entries.pop(progress_id)
             progress_file.last_updated = datetime.now()
 
-            await self._save_progress_file(category, progress_file)
+            record = {
+                "op": "delete",
+                "id": progress_id,
+                "last_updated": progress_file.last_updated.isoformat(),
+            }
+            flushed = self._submit(
+                category, state, [json.dumps(record, ensure_ascii=False) + "\n"]
+            )
 
-            return deleted_entry
+        await flushed
+        return deleted_entry
 
-    async def _save_progress_file(self, category: str, progress: ProgressFile) -> None:
-        """Save progress file for a category.
+    async def _save_progress_file(self, category: str, progress: ProgressFile) -> str:
+        """Save progress file for a category (full snapshot, clears the log).
 
         Args:
             category: Category name
             progress: Progress data to save
-        """
-        # Ensure directory exists
-        await aiofiles.os.makedirs(self.progress_path, exist_ok=True)
-
-        file_path = self.progress_path / f"{category}.json"
-
-        # Write atomically using a temporary file
-        temp_path = file_path.with_suffix(".tmp")
-        async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
-            await f.write(progress.model_dump_json(indent=2))
 
-        # Atomic replace
-        await aiofiles.os.replace(temp_path, file_path)
+        Returns:
+            Snapshot id of the written file
+        """
+        return await asyncio.to_thread(
+            _save_snapshot_sync,
+            self._snapshot_path(category),
+            self._log_path(category),
+            progress.model_dump_json(),
+        )
 
     async def category_has_progress(self, category: str) -> bool:
         """Check if a category has a progress file.
@@ -358,7 +862,7 @@ class ProgressService:
         Returns:
             True if progress file exists
         """
-        return await aiofiles.os.path.exists(self.progress_path / f"{category}.json")
+        return await aiofiles.os.path.exists(self._snapshot_path(category))
 
     async def list_categories(self) -> list[str]:
         """List all categories that have progress files.
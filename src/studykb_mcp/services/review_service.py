@@ -1,9 +1,30 @@
 """Ebbinghaus spaced repetition review algorithm service."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 from ..config import settings
 
+_MAX_TABLE_SIZE = 64
+
+
+@lru_cache(maxsize=8)
+def _interval_table(
+    initial_interval: float, multiplier: float, max_interval: float
+) -> tuple[tuple[float, timedelta], ...]:
+    """Precompute (days, timedelta) per review_count until the cap is reached.
+
+    Cached per settings so the many short-lived ReviewService instances
+    share one table.
+    """
+    table = []
+    for review_count in range(_MAX_TABLE_SIZE):
+        interval_days = min(initial_interval * (multiplier**review_count), max_interval)
+        table.append((interval_days, timedelta(days=interval_days)))
+        if interval_days >= max_interval:
+            break
+    return tuple(table)
+
 
 class ReviewService:
     """Service for calculating review schedules based on Ebbinghaus forgetting curve."""
@@ -12,6 +33,20 @@ class ReviewService:
         self.initial_interval = settings.review_initial_interval
         self.multiplier = settings.review_multiplier
         self.max_interval = settings.review_max_interval
+        self._intervals = _interval_table(
+            self.initial_interval, self.multiplier, self.max_interval
+        )
+
+    def _interval(self, review_count: int) -> tuple[float, timedelta]:
+        """Look up (days, timedelta) for a review count."""
+        if 0 <= review_count < len(self._intervals):
+            return self._intervals[review_count]
+        if review_count >= 0 and self._intervals[-1][0] >= self.max_interval:
+            return self._intervals[-1]  # capped from here on
+        interval_days = min(
+            self.initial_interval * (self.multiplier**review_count), self.max_interval
+        )
+        return interval_days, timedelta(days=interval_days)
 
     def calculate_next_review(self, from_date: datetime, review_count: int) -> datetime:
         """Calculate the next review date.
@@ -26,38 +61,43 @@ class ReviewService:
         Returns:
             The next review date (at 00:00:00)
         """
-        interval_days = self.initial_interval * (self.multiplier**review_count)
-        interval_days = min(interval_days, self.max_interval)
-
-        next_date = from_date + timedelta(days=interval_days)
+        next_date = from_date + self._interval(review_count)[1]
         return next_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    def get_overdue_days(self, next_review_at: datetime) -> int:
+    def get_overdue_days(self, next_review_at: datetime, now: datetime | None = None) -> int:
         """Calculate how many days overdue a review is.
 
         Args:
             next_review_at: The scheduled review date
+            now: Reference time (default: current time); pass one when
+                checking many entries
 
         Returns:
             Number of days overdue (0 if not yet due)
         """
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         if now < next_review_at:
             return 0
         return (now - next_review_at).days
 
-    def is_review_due(self, next_review_at: datetime | None) -> bool:
+    def is_review_due(
+        self, next_review_at: datetime | None, now: datetime | None = None
+    ) -> bool:
         """Check if a review is due.
 
         Args:
             next_review_at: The scheduled review date, or None if not scheduled
+            now: Reference time (default: current time)
 
         Returns:
             True if review is due, False otherwise
         """
         if next_review_at is None:
             return False
-        return datetime.now() >= next_review_at
+        if now is None:
+            now = datetime.now()
+        return now >= next_review_at
 
     def format_interval(self, review_count: int) -> str:
         """Format the review interval for display.
@@ -68,6 +108,4 @@ class ReviewService:
         Returns:
             Formatted interval string (e.g., "7d", "10d", "90d")
         """
-        interval_days = self.initial_interval * (self.multiplier**review_count)
-        interval_days = min(interval_days, self.max_interval)
-        return f"{int(interval_days)}d"
+        return f"{int(self._interval(review_count)[0])}d"
@@ -1,14 +1,335 @@
 """Workspace service for progress node file operations."""
 
+import asyncio
+import io
+import mmap
 import os
+import re
+import shutil
+import stat
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache, partial
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
+from typing import Any, NamedTuple
 
-import aiofiles
 import aiofiles.os
 
 from ..config import settings
 from .edit_strategy import EditStrategy, ReplaceResult
-from .history_service import HistoryService
+from .history_service import HistoryService, copy_snapshot_file, fsync_dir, write_snapshot_file
+
+# HistoryService.record_snapshot_sync bound to (file_path, version_id);
+# called as record(operation, description, size, lines)
+_Recorder = Callable[[str, str, int, int], None]
+
+MMAP_READ_MIN_BYTES = 64 * 1024  # smaller notes are simply streamed
+
+# A ".." component anywhere in a relative path (either separator style)
+_PARENT_COMPONENT = re.compile(r"(?:^|[/\\])\.\.(?:[/\\]|$)")
+_PATH_SEPARATORS = re.compile(r"[/\\]")  # same separators as _PARENT_COMPONENT
+
+# One HistoryService per workspace path, shared by every WorkspaceService
+# (the admin API builds one per request), so version ids stay monotonic
+# per workspace (LRU, HISTORY_CACHE_SIZE max)
+HISTORY_CACHE_SIZE = 128
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+# fdatasync skips the inode-metadata flush fsync does; not available on macOS
+_datasync = getattr(os, "fdatasync", os.fsync)
+_history_cache: OrderedDict[Path, HistoryService] = OrderedDict()
+
+
+class FileEntry(NamedTuple):
+    """A file in a workspace, as listed by list_files."""
+
+    path: str
+    type: str
+    size: int
+
+
+@lru_cache(maxsize=512)
+def _workspace_path(base: Path, category: str, progress_id: str) -> Path:
+    # Path is immutable, so the joined result can be shared between calls
+    return base / category / progress_id.replace(".", "_")
+
+
+def _read_range_sync(
+    path: Path, start_line: int, end_line: int | None, max_lines: int, max_size: int
+) -> tuple[list[tuple[int, str]], bool]:
+    """Size-check a file and stream lines start..end, stopping after max_lines.
+
+    Large files are scanned through mmap so only the selected lines are
+    ever decoded.
+
+    Returns:
+        Tuple of (list of (line_number, line_content), was_truncated)
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is larger than max_size
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > max_size:
+            raise ValueError(f"文件过大: {size} bytes (最大 {max_size})")
+        if size >= MMAP_READ_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _read_range_mmap(mm, start_line, end_line, max_lines)
+
+        # islice drops the lines before start_line and stops at the window's
+        # end without a Python-level loop; the comprehension fills the list
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        limit = max_lines if end_line is None else min(max_lines, end_line - start_line + 1)
+        window = islice(text, start_line - 1, start_line - 1 + max(limit, 0))
+        lines = [(line_num, line.rstrip("\n")) for line_num, line in enumerate(window, start_line)]
+
+        # Truncated if another line was requested beyond the cap and exists
+        truncated = (
+            len(lines) == max_lines
+            and (end_line is None or end_line >= start_line + max_lines)
+            and next(text, None) is not None
+        )
+    return lines, truncated
+
+
+def _read_range_mmap(
+    mm: mmap.mmap, start_line: int, end_line: int | None, max_lines: int
+) -> tuple[list[tuple[int, str]], bool]:
+    """Locate lines by searching for newline bytes in a mapped file."""
+    size = len(mm)
+    pos = 0
+    line_num = 1
+    while line_num < start_line:
+        newline = mm.find(b"\n", pos)
+        if newline == -1:
+            return [], False
+        pos = newline + 1
+        line_num += 1
+
+    lines: list[tuple[int, str]] = []
+    while pos < size and (end_line is None or line_num <= end_line):
+        if len(lines) == max_lines:
+            return lines, True
+        newline = mm.find(b"\n", pos)
+        stop = size if newline == -1 else newline
+        lines.append((line_num, mm[pos:stop].decode("utf-8").removesuffix("\r")))
+        pos = stop + 1
+        line_num += 1
+    return lines, False
+
+
+def _open_temp(path: Path) -> tuple[int, Path]:
+    """Create a unique hidden temp file next to path (like mkstemp, but 0o644).
+
+    A fixed ``{name}.tmp`` would be shared by concurrent writers of the
+    same file; O_EXCL on a random name gives each writer its own. Missing
+    parent directories are created.
+    """
+    while True:
+        temp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(temp_path, _WRITE_FLAGS | os.O_EXCL, 0o644), temp_path
+        except FileExistsError:
+            continue
+        except FileNotFoundError:
+            # First write into this directory; mkdir only when actually needed
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def _write_atomic_sync(path: Path, data: bytes) -> None:
+    """Write, fdatasync and rename over path in one worker-thread hop."""
+    fd, temp_path = _open_temp(path)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            _datasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_with_snapshot_sync(
+    path: Path, data: bytes, snap_file: Path, record: _Recorder
+) -> int:
+    """Snapshot, write, persist and record a workspace file in one worker-thread hop.
+
+    An existing file's OLD content is copied to snap_file; a new file's
+    content is snapshotted after the write. The directory is fsync'd once
+    at the end so the rename is durable.
+
+    Returns:
+        Number of lines written
+    """
+    line_count = data.count(b"\n") + 1 if data else 0
+    try:
+        size, lines = copy_snapshot_file(path, snap_file)
+        existed = True
+    except FileNotFoundError:
+        existed = False
+
+    _write_atomic_sync(path, data)
+
+    if not existed:
+        write_snapshot_file(snap_file, data)
+        size, lines = len(data), line_count
+    fsync_dir(path.parent)
+
+    if existed:
+        record("write", "文件覆写", size, lines)
+    else:
+        record("create", "文件创建", size, lines)
+    return line_count
+
+
+def _copy_atomic_sync(src: Path, path: Path) -> None:
+    """Copy src over path atomically without decoding it.
+
+    shutil.copyfile copies in the kernel (sendfile on Linux); the temp copy
+    is fdatasync'd before the rename, like _write_atomic_sync.
+    """
+    fd, temp_path = _open_temp(path)
+    try:
+        try:
+            shutil.copyfile(src, temp_path)  # same inode as fd
+            _datasync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _rollback_sync(
+    snap_path: Path, path: Path, snap_file: Path, max_size: int, record: _Recorder
+) -> None:
+    """Snapshot the current file, restore snap_path over it, persist and record.
+
+    All in one worker-thread hop, like _write_with_snapshot_sync: an
+    existing file's current content is snapshotted first (operation=write);
+    a deleted file's restored content is snapshotted after the copy
+    (operation=create).
+
+    Raises:
+        FileNotFoundError: If snap_path doesn't exist
+        ValueError: If snap_path is larger than max_size
+    """
+    size = os.stat(snap_path).st_size
+    if size > max_size:
+        raise ValueError(f"内容过大 (最大 {max_size} bytes)")
+
+    try:
+        old_size, old_lines = copy_snapshot_file(path, snap_file)
+        existed = True
+    except FileNotFoundError:
+        existed = False
+
+    _copy_atomic_sync(snap_path, path)
+    fsync_dir(path.parent)
+
+    if existed:
+        record("write", "文件覆写", old_size, old_lines)
+    else:
+        record("create", "文件创建", *copy_snapshot_file(path, snap_file))
+
+
+def _edit_sync(
+    full_path: Path,
+    snap_file: Path,
+    edit_strategy: EditStrategy,
+    old_string: str,
+    new_string: str,
+    expected_replacements: int,
+    record: _Recorder,
+) -> ReplaceResult:
+    """Read, replace, snapshot the old content, write and record in one worker-thread hop.
+
+    Nothing is written or recorded when the replacement fails.
+
+    Raises:
+        FileNotFoundError: If full_path doesn't exist
+    """
+    with open(full_path, "rb") as f:
+        old_data = f.read()
+    result = edit_strategy.perform_replacement_bytes(
+        old_data, old_string, new_string, expected_replacements
+    )
+    if not result.success or result.data is None:
+        return result
+
+    # Snapshot OLD content before saving edit
+    write_snapshot_file(snap_file, old_data)
+    _write_atomic_sync(full_path, result.data)
+    fsync_dir(full_path.parent)
+    record("edit", "文件编辑", len(old_data), old_data.count(b"\n") + 1 if old_data else 0)
+    return result
+
+
+def _delete_with_snapshot_sync(path: Path, snap_file: Path, record: _Recorder) -> None:
+    """Stat once, snapshot, remove and record a workspace file in one worker-thread hop.
+
+    Files that aren't UTF-8 text or couldn't be read are removed without
+    a snapshot.
+
+    Raises:
+        FileNotFoundError: If path doesn't exist
+        IsADirectoryError: If path is a directory
+    """
+    if stat.S_ISDIR(os.stat(path).st_mode):
+        raise IsADirectoryError(path)
+
+    snapshot: tuple[int, int] | None = None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        data.decode("utf-8")  # binary files are not snapshotted
+        write_snapshot_file(snap_file, data)
+        snapshot = len(data), data.count(b"\n") + 1 if data else 0
+    except (UnicodeDecodeError, OSError):
+        pass  # binary files or read errors — skip snapshot
+
+    os.remove(path)
+    if snapshot is not None:
+        record("delete", "文件删除", *snapshot)
+
+
+def _list_files_sync(root: Path) -> list[FileEntry]:
+    """List files under root with os.scandir (skipping .history).
+
+    Walks with an explicit stack of directories so deep trees don't
+    recurse. Directory symlinks are not followed, matching os.walk's default.
+    """
+    files: list[FileEntry] = []
+    stack: list[tuple[str, str]] = [(str(root), "")]
+    while stack:
+        dir_path, rel_root = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            if not rel_root:
+                raise
+            continue
+        with it:
+            for entry in it:
+                rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != HistoryService.HISTORY_DIR:
+                            stack.append((entry.path, rel_path))
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                files.append(FileEntry(rel_path, "file", size))
+    return files
 
 
 class WorkspaceService:
@@ -41,22 +362,45 @@ class WorkspaceService:
 
         Converts dots in progress_id to underscores to avoid path issues.
         """
-        safe_id = progress_id.replace(".", "_")
-        return self.workspaces_path / category / safe_id
+        return _workspace_path(self.workspaces_path, category, progress_id)
 
     def _validate_path(self, workspace_path: Path, file_path: str) -> Path:
-        """Validate that file path is within workspace (prevent path traversal)."""
-        full_path = (workspace_path / file_path).resolve()
-        workspace_resolved = workspace_path.resolve()
+        """Validate that file path is within workspace (prevent path traversal).
 
-        if not str(full_path).startswith(str(workspace_resolved)):
+        Absolute paths and any ``..`` component are rejected lexically, then
+        each component (split on ``/`` and ``\\``) gets one lstat instead of
+        a full resolve(). Only when the file itself or a directory on the
+        way is a symlink is the target resolved and checked against the
+        workspace.
+        """
+        if os.path.isabs(file_path) or _PARENT_COMPONENT.search(file_path):
             raise ValueError(f"路径越界: {file_path}")
 
+        full_path = workspace_path / file_path
+        # Walk every component, the file itself included: the first symlink
+        # found means the target has to be resolved and checked
+        current = workspace_path
+        for part in _PATH_SEPARATORS.split(file_path):
+            current = current / part
+            if os.path.islink(current):
+                if not full_path.resolve().is_relative_to(workspace_path.resolve()):
+                    raise ValueError(f"路径越界: {file_path}")
+                break
         return full_path
 
     def _get_history(self, category: str, progress_id: str) -> HistoryService:
-        """Get HistoryService for a workspace."""
-        return HistoryService(self._get_workspace_path(category, progress_id))
+        """Get (cached) HistoryService for a workspace."""
+        workspace_path = self._get_workspace_path(category, progress_id)
+        history = _history_cache.get(workspace_path)
+        if history is not None:
+            _history_cache.move_to_end(workspace_path)
+            return history
+
+        history = HistoryService(workspace_path)
+        _history_cache[workspace_path] = history
+        if len(_history_cache) > HISTORY_CACHE_SIZE:
+            _history_cache.popitem(last=False)
+        return history
 
     async def ensure_workspace(self, category: str, progress_id: str) -> Path:
         """Ensure workspace directory exists."""
@@ -84,36 +428,17 @@ class WorkspaceService:
         workspace_path = self._get_workspace_path(category, progress_id)
         full_path = self._validate_path(workspace_path, file_path)
 
-        if not await aiofiles.os.path.exists(full_path):
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-
-        # Check file size
-        stat = await aiofiles.os.stat(full_path)
-        if stat.st_size > self.max_file_size:
-            raise ValueError(f"文件过大: {stat.st_size} bytes (最大 {self.max_file_size})")
-
-        lines: list[tuple[int, str]] = []
-        truncated = False
-
-        async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
-            all_lines = await f.readlines()
-
-        if start_line is None:
-            start_line = 1
-        if end_line is None:
-            end_line = len(all_lines)
-
-        actual_start = max(1, start_line) - 1
-        actual_end = min(len(all_lines), end_line)
-
-        if actual_end - actual_start > self.max_read_lines:
-            actual_end = actual_start + self.max_read_lines
-            truncated = True
-
-        for i in range(actual_start, actual_end):
-            lines.append((i + 1, all_lines[i].rstrip("\n")))
-
-        return lines, truncated
+        try:
+            return await asyncio.to_thread(
+                _read_range_sync,
+                full_path,
+                max(1, start_line or 1),
+                end_line,
+                self.max_read_lines,
+                self.max_file_size,
+            )
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
 
     async def write_file(
         self,
@@ -121,38 +446,36 @@ class WorkspaceService:
         progress_id: str,
         file_path: str = "note.md",
         content: str = "",
-    ) -> None:
+    ) -> int:
         """Write file to workspace (create or overwrite).
 
         Automatically saves a history snapshot:
         - If the file already exists, snapshots the OLD content (operation=write)
         - If the file is new, snapshots the NEW content (operation=create)
+
+        Returns:
+            Number of lines written
         """
-        if len(content.encode("utf-8")) > self.max_file_size:
+        # UTF-8 needs at least one byte per character: reject oversized
+        # content before paying for the encode
+        if len(content) > self.max_file_size:
+            raise ValueError(f"内容过大 (最大 {self.max_file_size} bytes)")
+        data = content.encode("utf-8")
+        if len(data) > self.max_file_size:
             raise ValueError(f"内容过大 (最大 {self.max_file_size} bytes)")
 
-        workspace_path = await self.ensure_workspace(category, progress_id)
+        workspace_path = self._get_workspace_path(category, progress_id)
         full_path = self._validate_path(workspace_path, file_path)
-        await aiofiles.os.makedirs(full_path.parent, exist_ok=True)
 
         history = self._get_history(category, progress_id)
-        file_exists = await aiofiles.os.path.exists(full_path)
-
-        if file_exists:
-            # Snapshot the OLD content before overwriting
-            async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
-                old_content = await f.read()
-            await history.save_snapshot(file_path, old_content, "write", "文件覆写")
+        version_id, snap_file = history.new_snapshot_file(file_path)
 
-        # Write atomically
-        temp_path = full_path.with_suffix(".tmp")
-        async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
-            await f.write(content)
-        await aiofiles.os.replace(temp_path, full_path)
+        record = partial(history.record_snapshot_sync, file_path, version_id)
 
-        if not file_exists:
-            # Snapshot the NEW content for create
-            await history.save_snapshot(file_path, content, "create", "文件创建")
+        # Creates the workspace on first write
+        return await asyncio.to_thread(
+            _write_with_snapshot_sync, full_path, data, snap_file, record
+        )
 
     async def edit_file(
         self,
@@ -170,27 +493,22 @@ class WorkspaceService:
         workspace_path = self._get_workspace_path(category, progress_id)
         full_path = self._validate_path(workspace_path, file_path)
 
-        if not await aiofiles.os.path.exists(full_path):
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-
-        async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
-            content = await f.read()
-
-        result = self.edit_strategy.perform_replacement(
-            content, old_string, new_string, expected_replacements
-        )
-
-        if result.success and result.content is not None:
-            # Snapshot OLD content before saving edit
-            history = self._get_history(category, progress_id)
-            await history.save_snapshot(file_path, content, "edit", "文件编辑")
-
-            temp_path = full_path.with_suffix(".tmp")
-            async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
-                await f.write(result.content)
-            await aiofiles.os.replace(temp_path, full_path)
+        history = self._get_history(category, progress_id)
+        version_id, snap_file = history.new_snapshot_file(file_path)
 
-        return result
+        try:
+            return await asyncio.to_thread(
+                _edit_sync,
+                full_path,
+                snap_file,
+                self.edit_strategy,
+                old_string,
+                new_string,
+                expected_replacements,
+                partial(history.record_snapshot_sync, file_path, version_id),
+            )
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
 
     async def delete_file(
         self,
@@ -205,58 +523,30 @@ class WorkspaceService:
         workspace_path = self._get_workspace_path(category, progress_id)
         full_path = self._validate_path(workspace_path, file_path)
 
-        if not await aiofiles.os.path.exists(full_path):
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-
-        if await aiofiles.os.path.isdir(full_path):
-            raise IsADirectoryError(f"不能删除目录: {file_path}")
-
         # Snapshot content before deletion
         history = self._get_history(category, progress_id)
+        version_id, snap_file = history.new_snapshot_file(file_path)
+        record = partial(history.record_snapshot_sync, file_path, version_id)
         try:
-            async with aiofiles.open(full_path, "r", encoding="utf-8") as f:
-                old_content = await f.read()
-            await history.save_snapshot(file_path, old_content, "delete", "文件删除")
-        except (UnicodeDecodeError, OSError):
-            pass  # binary files or read errors — skip snapshot
-
-        await aiofiles.os.remove(full_path)
+            await asyncio.to_thread(_delete_with_snapshot_sync, full_path, snap_file, record)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
+        except IsADirectoryError:
+            raise IsADirectoryError(f"不能删除目录: {file_path}") from None
 
     async def list_files(
         self,
         category: str,
         progress_id: str,
-    ) -> list[dict[str, str | int]]:
+    ) -> list[FileEntry]:
         """List all files in workspace (excluding .history directory)."""
         workspace_path = self._get_workspace_path(category, progress_id)
 
-        if not await aiofiles.os.path.exists(workspace_path):
+        try:
+            files = await asyncio.to_thread(_list_files_sync, workspace_path)
+        except (FileNotFoundError, NotADirectoryError):
             return []
-
-        files: list[dict[str, str | int]] = []
-
-        for root, dirs, filenames in os.walk(workspace_path):
-            # Skip the .history directory
-            dirs[:] = [d for d in dirs if d != HistoryService.HISTORY_DIR]
-
-            root_path = Path(root)
-            rel_root = root_path.relative_to(workspace_path)
-
-            for filename in filenames:
-                file_path = root_path / filename
-                rel_path = rel_root / filename if str(rel_root) != "." else Path(filename)
-
-                try:
-                    stat = await aiofiles.os.stat(file_path)
-                    files.append({
-                        "path": str(rel_path),
-                        "type": "file",
-                        "size": stat.st_size,
-                    })
-                except OSError:
-                    continue
-
-        files.sort(key=lambda f: f["path"])
+        files.sort(key=attrgetter("path"))
         return files
 
     async def workspace_exists(self, category: str, progress_id: str) -> bool:
@@ -268,7 +558,7 @@ class WorkspaceService:
 
     async def list_file_history(
         self, category: str, progress_id: str, file_path: str
-    ) -> list[dict]:
+    ) -> list[dict[str, Any]]:
         """Return version list for a file (newest first)."""
         history = self._get_history(category, progress_id)
         return await history.list_versions(file_path)
@@ -285,15 +575,28 @@ class WorkspaceService:
     ) -> None:
         """Rollback a file to a previous version.
 
-        Reads the old snapshot and writes it via write_file(),
-        which automatically saves the current content as a new snapshot.
+        The snapshot is copied over the file on disk, never decoded into a
+        str. Like write_file(), the current content is saved as a new
+        snapshot first (or the restored content, if the file was deleted).
+
+        Raises:
+            FileNotFoundError: If the snapshot doesn't exist
+            ValueError: If the snapshot is larger than max_file_size
         """
-        old_content = await self.get_file_version(
-            category, progress_id, file_path, version_id
-        )
-        await self.write_file(
-            category=category,
-            progress_id=progress_id,
-            file_path=file_path,
-            content=old_content,
-        )
+        workspace_path = self._get_workspace_path(category, progress_id)
+        full_path = self._validate_path(workspace_path, file_path)
+
+        history = self._get_history(category, progress_id)
+        snap_path = history.get_version_path(file_path, version_id)
+        new_version_id, snap_file = history.new_snapshot_file(file_path)
+        try:
+            await asyncio.to_thread(
+                _rollback_sync,
+                snap_path,
+                full_path,
+                snap_file,
+                self.max_file_size,
+                partial(history.record_snapshot_sync, file_path, new_version_id),
+            )
+        except FileNotFoundError:
+            raise FileNotFoundError(f"快照不存在: {file_path} @ {version_id}") from None
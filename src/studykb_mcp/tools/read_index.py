@@ -25,14 +25,11 @@ async def read_index_handler(arguments: dict[str, Any]) -> str:
 
     if content is None:
         # Get available files for error message
-        categories = await kb_service.get_overview()
-        available_files: list[str] = []
-        for cat in categories:
-            if cat.name == category:
-                for mat in cat.materials:
-                    suffix = " [IDX]" if mat.has_index else ""
-                    available_files.append(f"{mat.name}{suffix}")
-                break
+        cat = await kb_service.get_category(category)
+        available_files = [
+            f"{mat.name} [IDX]" if mat.has_index else mat.name
+            for mat in (cat.materials if cat is not None else [])
+        ]
         return format_index_not_found(category, material, available_files)
 
     return content
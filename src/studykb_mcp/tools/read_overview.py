@@ -1,10 +1,19 @@
 """read_overview tool - Get overview of categories and materials."""
 
+import asyncio
+from pathlib import Path
 from typing import Any
 
 from ..services.kb_service import KBService
 from ..services.progress_service import ProgressService
 
+# Per category: (name, progress stats or None, material rows or None)
+_CategoryKey = tuple[str, tuple[int, ...] | None, tuple[tuple[str, int, bool], ...] | None]
+
+# Last rendered overview per (kb_path, progress_path), with the signature of
+# everything it shows
+_overview_cache: dict[tuple[Path, Path], tuple[tuple[_CategoryKey, ...], str]] = {}
+
 
 def _escape_value(value: str) -> str:
     """Escape special characters in TOON values."""
@@ -30,15 +39,39 @@ async def read_overview_handler(arguments: dict) -> str:
     progress_service = ProgressService()
     kb_service = KBService()
 
-    # Get categories from progress files
-    progress_categories = await progress_service.list_categories()
-
-    # Also check kb directories that might not have progress files yet
-    kb_categories_data = await kb_service.list_categories()
-    kb_category_names = {cat.name for cat in kb_categories_data}
+    # Categories from progress files, plus kb directories that might not
+    # have progress files yet
+    progress_categories, kb_categories_data = await asyncio.gather(
+        progress_service.list_categories(),
+        kb_service.list_categories(),
+    )
+    kb_by_name = {cat.name: cat for cat in kb_categories_data}
+    kb_category_names = kb_by_name.keys()
 
     # Build combined category list
-    all_category_names = set(progress_categories) | kb_category_names
+    progress_category_names = set(progress_categories)
+    all_category_names = sorted(progress_category_names | kb_category_names)
+
+    # Stats for every category with progress, loaded in one batched call
+    stats_by_name = await progress_service.get_multi_stats(
+        [name for name in all_category_names if name in progress_category_names]
+    )
+
+    # The listings and stats are already revalidated by mtime in the
+    # services; skip assembling the string when none of them changed
+    key: tuple[_CategoryKey, ...] = tuple([
+        (
+            cat_name,
+            tuple(stats_by_name[cat_name].values()) if cat_name in stats_by_name else None,
+            tuple([(m.name, m.line_count, m.has_index) for m in kb_by_name[cat_name].materials])
+            if cat_name in kb_by_name else None,
+        )
+        for cat_name in all_category_names
+    ])
+    paths = (kb_service.kb_path, progress_service.progress_path)
+    cached = _overview_cache.get(paths)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
     # Build TOON output
     lines = [
@@ -48,9 +81,9 @@ async def read_overview_handler(arguments: dict) -> str:
         f"with_kb: {len(kb_category_names)}",
     ]
 
-    for cat_name in sorted(all_category_names):
+    for cat_name in all_category_names:
         lines.append("")
-        has_progress = cat_name in progress_categories
+        has_progress = cat_name in progress_category_names
         has_kb = cat_name in kb_category_names
         flags = []
         if has_progress:
@@ -61,17 +94,18 @@ async def read_overview_handler(arguments: dict) -> str:
 
         # Get progress stats if available
         if has_progress:
-            progress = await progress_service.get_progress(cat_name)
-            stats = progress.get_stats()
+            stats = stats_by_name[cat_name]
             lines.append(f"stats: active={stats['active']},review={stats['review']},done={stats['done']},pending={stats['pending']}")
 
         # Get materials from kb if available
         if has_kb:
-            kb_cat = next((c for c in kb_categories_data if c.name == cat_name), None)
+            kb_cat = kb_by_name.get(cat_name)
             if kb_cat and kb_cat.materials:
                 lines.append(f"materials[{len(kb_cat.materials)}]{{filename,lines,has_index}}:")
                 for mat in kb_cat.materials:
                     index_flag = "Y" if mat.has_index else "N"
                     lines.append(f"  {mat.name},{mat.line_count},{index_flag}")
 
-    return "\n".join(lines)
+    output = "\n".join(lines)
+    _overview_cache[paths] = (key, output)
+    return output
@@ -1,10 +1,63 @@
 """Workspace tools - MCP tool handlers for workspace file operations."""
 
+from collections.abc import Awaitable, Callable
+from functools import lru_cache, wraps
+from pathlib import Path
 from typing import Any
 
+from ..config import settings
 from ..services.workspace_service import WorkspaceService
 
+_DIVIDER = "─" * 40
 
+_MATCH_TYPE_LABELS = {
+    "exact": "精确匹配",
+    "whitespace_flexible": "空白符容错匹配",
+    "token": "Token 匹配",
+}
+
+
+@lru_cache(maxsize=4)
+def _service_for(
+    workspaces_path: Path, max_file_size: int, max_read_lines: int
+) -> WorkspaceService:
+    # max_file_size / max_read_lines are only part of the key: the service
+    # copies them from settings when constructed
+    return WorkspaceService(workspaces_path)
+
+
+def _get_service() -> WorkspaceService:
+    """Shared WorkspaceService, rebuilt only when the settings it copies change."""
+    return _service_for(
+        settings.workspaces_path, settings.max_file_size, settings.max_read_lines
+    )
+
+
+def _format_size(size: int) -> str:
+    """Human-readable file size (B / KB / MB)."""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1 << 20:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1 << 20):.1f} MB"
+
+
+def _format_errors(
+    handler: Callable[[dict[str, Any]], Awaitable[str]],
+) -> Callable[[dict[str, Any]], Awaitable[str]]:
+    """Turn the service's user-facing errors into "❌ message" replies."""
+
+    @wraps(handler)
+    async def wrapper(arguments: dict[str, Any]) -> str:
+        try:
+            return await handler(arguments)
+        except (FileNotFoundError, IsADirectoryError, ValueError) as e:
+            return f"❌ {e}"
+
+    return wrapper
+
+
+@_format_errors
 async def read_workspace_file_handler(arguments: dict[str, Any]) -> str:
     """Handle read_workspace_file tool call.
 
@@ -25,38 +78,35 @@ async def read_workspace_file_handler(arguments: dict[str, Any]) -> str:
     start_line: int | None = arguments.get("start_line")
     end_line: int | None = arguments.get("end_line")
 
-    service = WorkspaceService()
-
-    try:
-        lines, truncated = await service.read_file(
-            category=category,
-            progress_id=progress_id,
-            file_path=file_path,
-            start_line=start_line,
-            end_line=end_line,
-        )
-    except FileNotFoundError as e:
-        return f"❌ {e}"
-    except ValueError as e:
-        return f"❌ {e}"
+    service = _get_service()
+
+    lines, truncated = await service.read_file(
+        category=category,
+        progress_id=progress_id,
+        file_path=file_path,
+        start_line=start_line,
+        end_line=end_line,
+    )
 
     # Format output
-    result = f"📄 {category}/{progress_id}/{file_path}\n"
+    parts = [f"📄 {category}/{progress_id}/{file_path}"]
 
     if lines:
-        result += f"行 {lines[0][0]}-{lines[-1][0]}\n"
-        result += "─" * 40 + "\n"
-        for line_num, line_content in lines:
-            result += f"{line_num:4d}│ {line_content}\n"
+        parts.append(f"行 {lines[0][0]}-{lines[-1][0]}")
+        parts.append(_DIVIDER)
+        parts.extend(f"{str(line_num).rjust(4)}│ {line_content}" for line_num, line_content in lines)
     else:
-        result += "(空文件)\n"
+        parts.append("(空文件)")
 
     if truncated:
-        result += f"\n⚠️ 内容已截断，最多显示 {len(lines)} 行"
+        parts.append(f"\n⚠️ 内容已截断，最多显示 {len(lines)} 行")
+    else:
+        parts.append("")
 
-    return result
+    return "\n".join(parts)
 
 
+@_format_errors
 async def write_workspace_file_handler(arguments: dict[str, Any]) -> str:
     """Handle write_workspace_file tool call.
 
@@ -75,22 +125,19 @@ async def write_workspace_file_handler(arguments: dict[str, Any]) -> str:
     content: str = arguments["content"]
     file_path: str = arguments.get("file_path", "note.md")
 
-    service = WorkspaceService()
+    service = _get_service()
 
-    try:
-        await service.write_file(
-            category=category,
-            progress_id=progress_id,
-            file_path=file_path,
-            content=content,
-        )
-    except ValueError as e:
-        return f"❌ {e}"
+    line_count = await service.write_file(
+        category=category,
+        progress_id=progress_id,
+        file_path=file_path,
+        content=content,
+    )
 
-    line_count = content.count("\n") + 1 if content else 0
     return f"✅ 已写入 {category}/{progress_id}/{file_path} ({line_count} 行)"
 
 
+@_format_errors
 async def edit_workspace_file_handler(arguments: dict[str, Any]) -> str:
     """Handle edit_workspace_file tool call.
 
@@ -113,34 +160,25 @@ async def edit_workspace_file_handler(arguments: dict[str, Any]) -> str:
     file_path: str = arguments.get("file_path", "note.md")
     expected_replacements: int = arguments.get("expected_replacements", 1)
 
-    service = WorkspaceService()
-
-    try:
-        result = await service.edit_file(
-            category=category,
-            progress_id=progress_id,
-            file_path=file_path,
-            old_string=old_string,
-            new_string=new_string,
-            expected_replacements=expected_replacements,
-        )
-    except FileNotFoundError as e:
-        return f"❌ {e}"
-    except ValueError as e:
-        return f"❌ {e}"
+    service = _get_service()
+
+    result = await service.edit_file(
+        category=category,
+        progress_id=progress_id,
+        file_path=file_path,
+        old_string=old_string,
+        new_string=new_string,
+        expected_replacements=expected_replacements,
+    )
 
     if result.success:
-        match_type_labels = {
-            "exact": "精确匹配",
-            "whitespace_flexible": "空白符容错匹配",
-            "token": "Token 匹配",
-        }
-        match_label = match_type_labels.get(result.match_type or "", result.match_type)
+        match_label = _MATCH_TYPE_LABELS.get(result.match_type or "", result.match_type)
         return f"✅ 已编辑 {category}/{progress_id}/{file_path} (匹配方式: {match_label})"
     else:
         return f"❌ 编辑失败\n{result.error}"
 
 
+@_format_errors
 async def delete_workspace_file_handler(arguments: dict[str, Any]) -> str:
     """Handle delete_workspace_file tool call.
 
@@ -157,20 +195,13 @@ async def delete_workspace_file_handler(arguments: dict[str, Any]) -> str:
     progress_id: str = arguments["progress_id"]
     file_path: str = arguments["file_path"]
 
-    service = WorkspaceService()
-
-    try:
-        await service.delete_file(
-            category=category,
-            progress_id=progress_id,
-            file_path=file_path,
-        )
-    except FileNotFoundError as e:
-        return f"❌ {e}"
-    except ValueError as e:
-        return f"❌ {e}"
-    except IsADirectoryError as e:
-        return f"❌ {e}"
+    service = _get_service()
+
+    await service.delete_file(
+        category=category,
+        progress_id=progress_id,
+        file_path=file_path,
+    )
 
     return f"✅ 已删除 {category}/{progress_id}/{file_path}"
 
@@ -189,7 +220,7 @@ async def list_workspace_handler(arguments: dict[str, Any]) -> str:
     category: str = arguments["category"]
     progress_id: str = arguments["progress_id"]
 
-    service = WorkspaceService()
+    service = _get_service()
 
     files = await service.list_files(
         category=category,
@@ -199,26 +230,11 @@ async def list_workspace_handler(arguments: dict[str, Any]) -> str:
     if not files:
         return f"📁 {category}/{progress_id}/\n(工作区为空或不存在)"
 
-    result = f"📁 {category}/{progress_id}/\n"
-    result += "─" * 40 + "\n"
-
-    total_size = 0
-    for file_info in files:
-        path = file_info["path"]
-        size = file_info["size"]
-        total_size += size
-
-        # Format size
-        if size < 1024:
-            size_str = f"{size} B"
-        elif size < 1024 * 1024:
-            size_str = f"{size / 1024:.1f} KB"
-        else:
-            size_str = f"{size / 1024 / 1024:.1f} MB"
+    parts = [f"📁 {category}/{progress_id}/", _DIVIDER]
 
-        result += f"  {path:<30} {size_str:>10}\n"
+    parts.extend(f"  {f.path.ljust(30)} {_format_size(f.size).rjust(10)}" for f in files)
 
-    result += "─" * 40 + "\n"
-    result += f"共 {len(files)} 个文件"
+    parts.append(_DIVIDER)
+    parts.append(f"共 {len(files)} 个文件")
 
-    return result
+    return "\n".join(parts)
@@ -1,36 +1,40 @@
 """Datetime utilities."""
 
 from datetime import datetime
+from functools import lru_cache
 
 
-def format_relative_time(dt: datetime) -> str:
+def format_relative_time(dt: datetime, now: datetime | None = None) -> str:
     """Format a datetime as a relative time string.
 
     Args:
         dt: The datetime to format
+        now: Reference time; list renderers pass one value for every row
+            instead of reading the clock per call (default: datetime.now())
 
     Returns:
         Relative time string (e.g., "2h ago", "3d ago", "Jan 19")
     """
-    now = datetime.now()
-    diff = now - dt
-
-    if diff.days == 0:
-        hours = diff.seconds // 3600
-        if hours == 0:
-            minutes = diff.seconds // 60
-            if minutes == 0:
-                return "just now"
-            return f"{minutes}m ago"
-        return f"{hours}h ago"
-    elif diff.days == 1:
+    diff = (now or datetime.now()) - dt
+    seconds = diff.total_seconds()
+
+    # Same day (diff.days == 0) decided by one float comparison cascade
+    if 0 <= seconds < 86400:
+        if seconds < 60:
+            return "just now"
+        if seconds < 3600:
+            return f"{int(seconds) // 60}m ago"
+        return f"{int(seconds) // 3600}h ago"
+
+    days = diff.days
+    if days == 1:
         return "yesterday"
-    elif diff.days < 7:
-        return f"{diff.days}d ago"
-    else:
-        return dt.strftime("%b %d")
+    if days < 7:
+        return f"{days}d ago"
+    return dt.strftime("%b %d")
 
 
+@lru_cache(maxsize=1024)
 def format_date_short(dt: datetime) -> str:
     """Format a datetime as a short date.
 
@@ -6,18 +6,23 @@ TOON format optimizes token usage by:
 - Explicit [N] length for validation
 """
 
+import io
+from collections.abc import Iterator
 from datetime import datetime
+from functools import lru_cache
 
 from ..models.kb import Category
 from ..models.progress import ProgressEntry, ProgressFile, ProgressStatus, RelatedSection
 from ..services.kb_service import GrepResult
-from ..services.review_service import ReviewService
 
 
 def _escape_value(value: str) -> str:
     """Escape special characters in TOON values."""
     if not value:
         return ""
+    # Most values need no escaping; the membership tests are cheap scans
+    if "," not in value and "\n" not in value and "\\" not in value:
+        return value
     # Escape commas and newlines in values
     value = value.replace("\\", "\\\\")
     value = value.replace(",", "\\,")
@@ -25,13 +30,22 @@ def _escape_value(value: str) -> str:
     return value
 
 
-def _format_date(dt: datetime | None, with_time: bool = True) -> str:
-    """Format datetime compactly."""
-    if not dt:
-        return "-"
-    if with_time:
-        return dt.strftime("%m-%d %H:%M")
-    return dt.strftime("%m-%d")
+@lru_cache(maxsize=1024)
+def _format_datetime(dt: datetime | None) -> str:
+    """Format datetime compactly as ``MM-DD HH:MM``."""
+    # 进度条目的时间戳反复出现，strftime 结果按值缓存
+    return dt.strftime("%m-%d %H:%M") if dt else "-"
+
+
+@lru_cache(maxsize=1024)
+def _format_day(dt: datetime | None) -> str:
+    """Format datetime compactly as ``MM-DD``."""
+    return dt.strftime("%m-%d") if dt else "-"
+
+
+def _overdue_days(due: datetime, now: datetime) -> int:
+    """Days a review is overdue (0 if not yet due)."""
+    return max(0, (now - due).days)
 
 
 def _format_sections(sections: list[RelatedSection]) -> str:
@@ -42,10 +56,39 @@ def _format_sections(sections: list[RelatedSection]) -> str:
     """
     if not sections:
         return "-"
-    parts = []
-    for sec in sections:
-        parts.append(f"{sec.material}:{sec.start_line}-{sec.end_line}")
-    return "|".join(parts)
+    if len(sections) == 1:
+        # Most entries link a single section: skip the list and the join
+        sec = sections[0]
+        return f"{sec.material}:{sec.start_line}-{sec.end_line}"
+    return "|".join([f"{sec.material}:{sec.start_line}-{sec.end_line}" for sec in sections])
+
+
+def _updated_columns(entry: ProgressEntry, now: datetime) -> str:
+    return _format_datetime(entry.updated_at)
+
+
+def _review_columns(entry: ProgressEntry, now: datetime) -> str:
+    if not entry.next_review_at:
+        return "-,-"
+    overdue = _overdue_days(entry.next_review_at, now)
+    overdue_str = f"{overdue}d" if overdue > 0 else "-"
+    return f"{_format_day(entry.next_review_at)},{overdue_str}"
+
+
+def _done_columns(entry: ProgressEntry, now: datetime) -> str:
+    return (
+        f"{_format_day(entry.mastered_at)},"
+        f"{_format_day(entry.next_review_at)}"
+    )
+
+
+# format_progress groups in output order: (status, show_time fields, their columns)
+_STATUS_GROUPS = (
+    ("active", "updated", _updated_columns),
+    ("review", "due,overdue", _review_columns),
+    ("done", "mastered,next_review", _done_columns),
+    ("pending", "updated", _updated_columns),
+)
 
 
 def format_overview(categories: list[Category]) -> str:
@@ -61,25 +104,27 @@ def format_overview(categories: list[Category]) -> str:
         return "# overview\nstatus: empty\nmessage: No categories found. Create a directory in kb/ to get started."
 
     total_files = sum(c.file_count for c in categories)
-    lines = [
-        "# overview",
-        f"total: {len(categories)} categories, {total_files} files",
-        "",
-    ]
+    # StringIO instead of a list of lines: no per-line list to hold at the
+    # final join, which lowers peak memory for large knowledge bases
+    buf = io.StringIO()
+    write = buf.write
+    write(f"# overview\ntotal: {len(categories)} categories, {total_files} files\n\n")
 
     # Categories with materials
     for cat in categories:
-        lines.append(f"## {cat.name}")
+        write(f"## {cat.name}\n")
         if cat.materials:
-            lines.append(f"materials[{len(cat.materials)}]{{filename,lines,has_index}}:")
-            for mat in cat.materials:
-                index_flag = "Y" if mat.has_index else "N"
-                lines.append(f"  {mat.name},{mat.line_count},{index_flag}")
+            write(f"materials[{len(cat.materials)}]{{filename,lines,has_index}}:\n")
+            # Rows per category in one join, the index flag inlined
+            write("".join([
+                f"  {mat.name},{mat.line_count},{'Y' if mat.has_index else 'N'}\n"
+                for mat in cat.materials
+            ]))
         else:
-            lines.append("  (no materials)")
-        lines.append("")
+            write("  (no materials)\n")
+        write("\n")
 
-    return "\n".join(lines).rstrip()
+    return buf.getvalue().rstrip()
 
 
 def format_progress(
@@ -97,103 +142,58 @@ def format_progress(
     Returns:
         TOON formatted string
     """
-    review_service = ReviewService()
-    stats = progress.get_stats()
-
-    # Group entries by status
-    by_status: dict[str, list[tuple[str, ProgressEntry]]] = {
-        "active": [],
-        "review": [],
-        "done": [],
-        "pending": [],
-    }
-
-    for entry_id, entry in progress.entries.items():
-        by_status[entry.status].append((entry_id, entry))
-
-    # Sort each group by updated_at descending
-    for status in by_status:
-        by_status[status].sort(key=lambda x: x[1].updated_at, reverse=True)
-
-    # Build output
-    lines = [
-        f"# progress: {progress.category}",
-        f"stats: active={stats['active']},review={stats['review']},done={stats['done']},pending={stats['pending']}",
-    ]
+    if not progress.entries:
+        # Nothing to sort or group
+        header = f"# progress: {progress.category}\nstats: active=0,review=0,done=0,pending=0"
+        if status_filter:
+            return f"{header}\nfilter: {','.join(status_filter)}"
+        return header
+
+    now = datetime.now()
+
+    # Groups newest first; ProgressService.get_progress hands them over
+    # already ordered, so usually nothing is sorted here
+    by_status = progress.status_groups()
+
+    # Build output; every line after the first is written with a leading
+    # newline so the buffer never ends with a separator. The partition
+    # already holds every entry, so the group sizes are the stats; no
+    # second pass through progress.get_stats()
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        f"# progress: {progress.category}\n"
+        f"stats: active={len(by_status['active'])},review={len(by_status['review'])},"
+        f"done={len(by_status['done'])},pending={len(by_status['pending'])}"
+    )
 
     if status_filter:
-        lines.append(f"filter: {','.join(status_filter)}")
+        write(f"\nfilter: {','.join(status_filter)}")
 
-    # Active entries
-    if by_status["active"]:
-        lines.append("")
-        if show_time:
-            lines.append(f"active[{len(by_status['active'])}]{{id,name,updated,comment,sections}}:")
-            for entry_id, entry in by_status["active"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{_format_date(entry.updated_at)},{comment},{sections}")
-        else:
-            lines.append(f"active[{len(by_status['active'])}]{{id,name,comment,sections}}:")
-            for entry_id, entry in by_status["active"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{comment},{sections}")
-
-    # Review entries (with overdue info)
-    if by_status["review"]:
-        lines.append("")
-        if show_time:
-            lines.append(f"review[{len(by_status['review'])}]{{id,name,due,overdue,comment,sections}}:")
-            for entry_id, entry in by_status["review"]:
-                due = _format_date(entry.next_review_at, with_time=False) if entry.next_review_at else "-"
-                overdue = review_service.get_overdue_days(entry.next_review_at) if entry.next_review_at else 0
-                overdue_str = f"{overdue}d" if overdue > 0 else "-"
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{due},{overdue_str},{comment},{sections}")
-        else:
-            lines.append(f"review[{len(by_status['review'])}]{{id,name,comment,sections}}:")
-            for entry_id, entry in by_status["review"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{comment},{sections}")
-
-    # Done entries
-    if by_status["done"]:
-        lines.append("")
-        if show_time:
-            lines.append(f"done[{len(by_status['done'])}]{{id,name,mastered,next_review,comment,sections}}:")
-            for entry_id, entry in by_status["done"]:
-                mastered = _format_date(entry.mastered_at, with_time=False) if entry.mastered_at else "-"
-                next_rev = _format_date(entry.next_review_at, with_time=False) if entry.next_review_at else "-"
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{mastered},{next_rev},{comment},{sections}")
-        else:
-            lines.append(f"done[{len(by_status['done'])}]{{id,name,comment,sections}}:")
-            for entry_id, entry in by_status["done"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{comment},{sections}")
-
-    # Pending entries
-    if by_status["pending"]:
-        lines.append("")
+    for status, time_fields, time_columns in _STATUS_GROUPS:
+        group = by_status[status]
+        if not group:
+            continue
+        # One comprehension per group, joined into a single write (faster
+        # than feeding writelines() a generator row by row); the show_time
+        # branch is hoisted out, and f-strings beat pre-bound str.format /
+        # %-templates in CPython
         if show_time:
-            lines.append(f"pending[{len(by_status['pending'])}]{{id,name,updated,comment,sections}}:")
-            for entry_id, entry in by_status["pending"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{_format_date(entry.updated_at)},{comment},{sections}")
+            write(f"\n\n{status}[{len(group)}]{{id,name,{time_fields},comment,sections}}:")
+            write("".join([
+                f"\n  {entry_id},{_escape_value(entry.name)},{time_columns(entry, now)},"
+                f"{_escape_value(entry.comment)},{_format_sections(entry.related_sections)}"
+                for entry_id, entry in group
+            ]))
         else:
-            lines.append(f"pending[{len(by_status['pending'])}]{{id,name,comment,sections}}:")
-            for entry_id, entry in by_status["pending"]:
-                comment = _escape_value(entry.comment) if entry.comment else ""
-                sections = _format_sections(entry.related_sections)
-                lines.append(f"  {entry_id},{_escape_value(entry.name)},{comment},{sections}")
+            write(f"\n\n{status}[{len(group)}]{{id,name,comment,sections}}:")
+            write("".join([
+                f"\n  {entry_id},{_escape_value(entry.name)},"
+                f"{_escape_value(entry.comment)},{_format_sections(entry.related_sections)}"
+                for entry_id, entry in group
+            ]))
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def format_progress_update(
@@ -232,7 +232,7 @@ def format_progress_update(
 
     if entry.next_review_at:
         days = (entry.next_review_at - datetime.now()).days
-        lines.append(f"next_review: {_format_date(entry.next_review_at, with_time=False)} ({days}d)")
+        lines.append(f"next_review: {_format_day(entry.next_review_at)} ({days}d)")
 
     # Show related sections count in update confirmation
     if entry.related_sections:
@@ -260,28 +260,30 @@ def format_progress_detail(
         f"# detail: {category}/{progress_id}",
         f"name: {entry.name}",
         f"status: {entry.status}",
-        f"updated: {_format_date(entry.updated_at)}",
+        f"updated: {_format_datetime(entry.updated_at)}",
     ]
 
     if entry.comment:
         lines.append(f"comment: {_escape_value(entry.comment)}")
 
     if entry.mastered_at:
-        lines.append(f"mastered: {_format_date(entry.mastered_at, with_time=False)}")
+        lines.append(f"mastered: {_format_day(entry.mastered_at)}")
 
     lines.append(f"review_count: {entry.review_count}")
 
     if entry.next_review_at:
         days = (entry.next_review_at - datetime.now()).days
-        lines.append(f"next_review: {_format_date(entry.next_review_at, with_time=False)} ({days}d)")
+        lines.append(f"next_review: {_format_day(entry.next_review_at)} ({days}d)")
 
     # Related sections
     if entry.related_sections:
         lines.append("")
         lines.append(f"related_sections[{len(entry.related_sections)}]{{material,range,desc}}:")
-        for sec in entry.related_sections:
-            desc = _escape_value(sec.desc) if sec.desc else ""
-            lines.append(f"  {sec.material},{sec.start_line}-{sec.end_line},{desc}")
+        # _escape_value already maps "" to ""; no per-row guard needed
+        lines.extend([
+            f"  {sec.material},{sec.start_line}-{sec.end_line},{_escape_value(sec.desc)}"
+            for sec in entry.related_sections
+        ])
     else:
         lines.append("")
         lines.append("related_sections: (none)")
@@ -310,21 +312,57 @@ def format_read_file(
     Returns:
         TOON formatted string
     """
-    output_lines = [
-        f"# file: {category}/{material}",
-        f"range: {start_line}-{end_line} ({len(lines)} lines)",
-    ]
-
+    header = f"# file: {category}/{material}\nrange: {start_line}-{end_line} ({len(lines)} lines)"
     if truncated:
-        output_lines.append("warning: Content truncated. Request a smaller range.")
+        header += "\nwarning: Content truncated. Request a smaller range."
+
+    # Each row carries its own newline, so an empty range still closes the fence.
+    # str.rjust skips the format-spec parser that f"{n:>5}" runs per row
+    body = "".join([f"{str(line_num).rjust(5)}| {text}\n" for line_num, text in lines])
+    return f"{header}\n\n```\n{body}```"
+
+
+def _iter_grep_results(
+    category: str,
+    pattern: str,
+    material: str | None,
+    results: list[GrepResult],
+    max_matches: int,
+) -> Iterator[str]:
+    """Yield format_grep_results() output as chunks to be joined with "\\n"."""
+    total_matches = sum(r.total_matches for r in results)
+
+    yield (
+        f"# grep: {category}" + (f"/{material}" if material else "") + "\n"
+        f"pattern: {pattern}\n"
+        f"matches: {total_matches} (max: {max_matches})"
+    )
+
+    if total_matches == 0:
+        yield "\n(no matches found)"
+        return
+
+    for r in results:
+        if not r.matches:
+            continue
 
-    output_lines.append("")
-    output_lines.append("```")
-    for line_num, text in lines:
-        output_lines.append(f"{line_num:>5}| {text}")
-    output_lines.append("```")
+        yield f"\n## {r.material} ({r.total_matches} matches)"
 
-    return "\n".join(output_lines)
+        # 每个匹配块整体产出，而不是逐行进入一个大列表
+        for match in r.matches:
+            context = match.context
+            if len(context) == 1:
+                # context_lines=0: the match line alone, no list or join
+                line_num, text, is_match = context[0]
+                yield f"\n{str(line_num).rjust(5)}{'>' if is_match else ' '}| {text}"
+                continue
+            if not context:
+                yield ""
+                continue
+            yield "\n" + "\n".join([
+                f"{str(line_num).rjust(5)}{'>' if is_match else ' '}| {text}"
+                for line_num, text, is_match in context
+            ])
 
 
 def format_grep_results(
@@ -346,32 +384,7 @@ def format_grep_results(
     Returns:
         TOON formatted string
     """
-    total_matches = sum(r.total_matches for r in results)
-
-    lines = [
-        f"# grep: {category}" + (f"/{material}" if material else ""),
-        f"pattern: {pattern}",
-        f"matches: {total_matches} (max: {max_matches})",
-    ]
-
-    for r in results:
-        if not r.matches:
-            continue
-
-        lines.append("")
-        lines.append(f"## {r.material} ({r.total_matches} matches)")
-
-        for match in r.matches:
-            lines.append("")
-            for ctx in match.context:
-                marker = ">" if ctx["is_match"] else " "
-                lines.append(f"{ctx['line_num']:>5}{marker}| {ctx['text']}")
-
-    if not results or total_matches == 0:
-        lines.append("")
-        lines.append("(no matches found)")
-
-    return "\n".join(lines)
+    return "\n".join(_iter_grep_results(category, pattern, material, results, max_matches))
 
 
 def format_index_not_found(category: str, material: str, available_files: list[str]) -> str:
@@ -399,10 +412,8 @@ def format_index_not_found(category: str, material: str, available_files: list[s
 
         lines.append("")
         lines.append(f"available_files[{len(available_files)}]:")
-        for f in with_index:
-            lines.append(f"  {f}")
-        for f in without_index:
-            lines.append(f"  {f}")
+        lines.extend([f"  {f}" for f in with_index])
+        lines.extend([f"  {f}" for f in without_index])
 
     return "\n".join(lines)
 
@@ -431,9 +442,7 @@ def format_file_not_found(category: str, material: str, available_files: list[st
 
         lines.append("")
         lines.append(f"available_files[{len(available_files)}]:")
-        for f in with_index:
-            lines.append(f"  {f}")
-        for f in without_index:
-            lines.append(f"  {f}")
+        lines.extend([f"  {f}" for f in with_index])
+        lines.extend([f"  {f}" for f in without_index])
 
     return "\n".join(lines)
@@ -18,10 +18,10 @@ def temp_dir():
     shutil.rmtree(tmp)
 
 
-@pytest.fixture
-def sample_kb(temp_dir):
-    """Create a sample knowledge base structure."""
-    kb_path = temp_dir / "kb"
+@pytest.fixture(scope="session")
+def _sample_kb_master(tmp_path_factory):
+    """Build the sample knowledge base once per session."""
+    kb_path = tmp_path_factory.mktemp("sample") / "kb"
     kb_path.mkdir()
 
     # Create category: 数据结构
@@ -71,7 +71,7 @@ Kruskal算法是最小生成树算法之一。
 
 Prim算法也是最小生成树算法。
 """
-    (ds_path / "数据结构教材.md").write_text(material_content, encoding="utf-8")
+    (ds_path / "数据结构教材.md").write_bytes(material_content.encode("utf-8"))
 
     # Create index file
     index_content = """# 数据结构教材索引
@@ -91,19 +91,28 @@ Prim算法也是最小生成树算法。
 | Kruskal算法 | 36 |
 | Prim算法 | 38 |
 """
-    (ds_path / "数据结构教材_index.md").write_text(index_content, encoding="utf-8")
+    (ds_path / "数据结构教材_index.md").write_bytes(index_content.encode("utf-8"))
 
     # Create another material without index
-    (ds_path / "算法笔记.md").write_text("# 算法笔记\n\n一些算法笔记内容。\n" * 10, encoding="utf-8")
+    (ds_path / "算法笔记.md").write_bytes(("# 算法笔记\n\n一些算法笔记内容。\n" * 10).encode("utf-8"))
 
     # Create another category: 计算机组成原理
     co_path = kb_path / "计算机组成原理"
     co_path.mkdir()
-    (co_path / "计组教材.md").write_text("# 计算机组成原理\n\n内容...\n" * 5, encoding="utf-8")
+    (co_path / "计组教材.md").write_bytes(("# 计算机组成原理\n\n内容...\n" * 5).encode("utf-8"))
 
     return kb_path
 
 
+@pytest.fixture
+def sample_kb(temp_dir, _sample_kb_master):
+    """Create a sample knowledge base structure."""
+    # Plain copies, not hard links: tests rewrite materials in place
+    kb_path = temp_dir / "kb"
+    shutil.copytree(_sample_kb_master, kb_path, copy_function=shutil.copy)
+    return kb_path
+
+
 @pytest.fixture
 def sample_progress(temp_dir):
     """Create a sample progress directory."""
@@ -149,11 +158,7 @@ def sample_progress(temp_dir):
         },
     )
 
-    import json
-
-    (progress_path / "数据结构.json").write_text(
-        progress.model_dump_json(indent=2), encoding="utf-8"
-    )
+    (progress_path / "数据结构.json").write_bytes(progress.model_dump_json().encode("utf-8"))
 
     return progress_path
 
@@ -8,6 +8,9 @@ from studykb_mcp.server import HANDLERS, TOOLS, call_tool, list_tools
 class TestMCPServer:
     """Integration tests for MCP server."""
 
+    # One event loop for the whole module instead of one per test
+    pytestmark = pytest.mark.asyncio(loop_scope="module")
+
     @pytest.mark.asyncio
     async def test_list_tools(self):
         """Test that list_tools returns all tools."""
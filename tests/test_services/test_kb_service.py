@@ -27,6 +27,24 @@ class TestKBService:
 
         assert len(categories) == 0
 
+    @pytest.mark.asyncio
+    async def test_list_categories_cache_invalidation(self, sample_kb):
+        """Test that cached listings pick up added and rewritten materials."""
+        service = KBService(kb_path=sample_kb)
+        await service.list_categories()
+
+        ds_path = sample_kb / "数据结构"
+        (ds_path / "新资料.md").write_text("a\nb\n", encoding="utf-8")
+        with open(ds_path / "算法笔记.md", "w", encoding="utf-8") as f:
+            f.write("one line\n")
+
+        categories = await service.list_categories()
+        ds_category = next(c for c in categories if c.name == "数据结构")
+        by_name = {m.name: m for m in ds_category.materials}
+
+        assert by_name["新资料.md"].line_count == 2
+        assert by_name["算法笔记.md"].line_count == 1
+
     @pytest.mark.asyncio
     async def test_list_materials(self, sample_kb):
         """Test listing materials in a category."""
@@ -40,6 +58,27 @@ class TestKBService:
         assert "数据结构教材" in material_names
         assert "算法笔记" in material_names
 
+    @pytest.mark.asyncio
+    async def test_get_category(self, sample_kb):
+        """Test looking up a single category."""
+        service = KBService(kb_path=sample_kb)
+        category = await service.get_category("数据结构")
+
+        assert category is not None
+        assert category.file_count == 2
+        assert await service.get_category("不存在的分类") is None
+
+    @pytest.mark.asyncio
+    async def test_get_category_rejects_paths(self, sample_kb):
+        """Test that hidden names and paths outside the kb are not listed."""
+        (sample_kb / ".git").mkdir()
+        (sample_kb / ".git" / "leak.md").write_text("x\n", encoding="utf-8")
+        (sample_kb.parent / "outside.md").write_text("x\n", encoding="utf-8")
+        service = KBService(kb_path=sample_kb)
+
+        for name in ("..", ".git", "../..", "数据结构/..", "数据结构\\..", "", "/tmp"):
+            assert await service.get_category(name) is None
+
     @pytest.mark.asyncio
     async def test_material_has_index(self, sample_kb):
         """Test detecting index files."""
@@ -84,6 +123,69 @@ class TestKBService:
         assert truncated is True
         assert len(lines) == 10
 
+    @pytest.mark.asyncio
+    async def test_read_file_range_uses_line_index(self, sample_kb):
+        """Test reading deep into a large file via the side-car line index."""
+        big = sample_kb / "数据结构" / "大文件.md"
+        big.write_text("".join(f"line {i}\n" for i in range(1, 5001)), encoding="utf-8")
+
+        service = KBService(kb_path=sample_kb)
+        lines, _ = await service.read_file_range(
+            category="数据结构",
+            material="大文件.md",
+            start_line=3000,
+            end_line=3002,
+        )
+
+        assert lines == [(3000, "line 3000"), (3001, "line 3001"), (3002, "line 3002")]
+        assert (sample_kb / "数据结构" / ".大文件.md.lineidx").exists()
+
+        # Rewriting the file invalidates the index
+        big.write_text("".join(f"row {i}\n" for i in range(1, 5001)), encoding="utf-8")
+        lines, _ = await service.read_file_range(
+            category="数据结构",
+            material="大文件.md",
+            start_line=4096,
+            end_line=4096,
+        )
+
+        assert lines == [(4096, "row 4096")]
+
+    def test_load_offsets_rebuilds_corrupt_index(self, sample_kb):
+        """Test that a side-car with malformed offsets is rebuilt."""
+        import json
+
+        from studykb_mcp.services import line_index
+
+        big = sample_kb / "数据结构" / "大文件.md"
+        big.write_text("".join(f"line {i}\n" for i in range(1, 3001)), encoding="utf-8")
+        expected = line_index.load_offsets(big)
+
+        index_path = sample_kb / "数据结构" / ".大文件.md.lineidx"
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+        data["offsets"] = ["0", None]
+        index_path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert line_index.load_offsets(big) == expected
+        assert json.loads(index_path.read_text(encoding="utf-8"))["offsets"] == expected
+
+    @pytest.mark.asyncio
+    async def test_read_file_range_sed_path(self, sample_kb, monkeypatch):
+        """Test that huge files are filtered by sed with identical results."""
+        from studykb_mcp.services import line_index
+
+        monkeypatch.setattr(line_index, "SED_MIN_BYTES", 0)
+
+        service = KBService(kb_path=sample_kb)
+        lines, _ = await service.read_file_range(
+            category="数据结构",
+            material="数据结构教材.md",
+            start_line=1,
+            end_line=3,
+        )
+
+        assert lines == [(1, "# 数据结构教材"), (2, ""), (3, "## 第1章 绪论")]
+
     @pytest.mark.asyncio
     async def test_read_file_not_found(self, sample_kb):
         """Test reading a non-existent file."""
@@ -142,6 +244,15 @@ class TestKBService:
         total_matches = sum(r.total_matches for r in results)
         assert total_matches >= 1
 
+    @pytest.mark.asyncio
+    async def test_grep_all_files_max_matches(self, sample_kb):
+        """Test that the match budget is spent on files in name order."""
+        service = KBService(kb_path=sample_kb)
+        results = await service.grep(category="数据结构", pattern="算法", max_matches=3)
+
+        assert sum(r.total_matches for r in results) == 3
+        assert results[0].material == "数据结构教材.md"
+
     @pytest.mark.asyncio
     async def test_grep_no_matches(self, sample_kb):
         """Test grepping with no matches."""
@@ -166,6 +277,18 @@ class TestKBService:
         assert len(results) == 1
         assert results[0].total_matches >= 1
 
+    @pytest.mark.asyncio
+    async def test_grep_unicode_case_folding(self, sample_kb):
+        """Test that characters with irregular lowercase forms still match."""
+        (sample_kb / "数据结构" / "单位.md").write_text(
+            "温度 300\u212a\nİstanbul\n", encoding="utf-8"
+        )
+        service = KBService(kb_path=sample_kb)
+
+        for pattern, line_num in (("300k", 1), ("i\u0307stanbul", 2)):
+            results = await service.grep(category="数据结构", pattern=pattern, material="单位.md")
+            assert [m.line_num for m in results[0].matches] == [line_num]
+
     @pytest.mark.asyncio
     async def test_grep_context_lines(self, sample_kb):
         """Test grep context lines."""
@@ -182,6 +305,57 @@ class TestKBService:
         # Context should include lines before and after
         assert len(match.context) >= 1
 
+    @pytest.mark.asyncio
+    async def test_grep_mmap_matches_text_scan(self, sample_kb, monkeypatch):
+        """Test that the mmap scan returns the same matches as the line scan."""
+        from studykb_mcp.services import kb_service
+
+        service = KBService(kb_path=sample_kb)
+        kwargs = {"category": "数据结构", "pattern": "kruskal", "context_lines": 2}
+
+        expected = await service.grep(**kwargs)
+        monkeypatch.setattr(kb_service, "MMAP_GREP_MIN_BYTES", 0)
+        results = await service.grep(**kwargs)
+
+        assert results == expected
+        assert results[0].matches[0].context[2].is_match is True
+
+    @pytest.mark.asyncio
+    async def test_grep_without_context(self, sample_kb, monkeypatch):
+        """Test that context_lines=0 yields only the match line on both scan paths."""
+        from studykb_mcp.services import kb_service
+
+        service = KBService(kb_path=sample_kb)
+        kwargs = {"category": "数据结构", "pattern": "kruskal", "context_lines": 0}
+
+        expected = await service.grep(**kwargs)
+        monkeypatch.setattr(kb_service, "MMAP_GREP_MIN_BYTES", 0)
+        results = await service.grep(**kwargs)
+
+        assert results == expected
+        match = results[0].matches[0]
+        assert match.context == [(match.line_num, match.context[0].text, True)]
+
+    @pytest.mark.asyncio
+    async def test_grep_mmap_edge_patterns(self, sample_kb, monkeypatch):
+        """Test that case-folding and empty patterns match alike on both scan paths."""
+        from studykb_mcp.services import kb_service
+
+        (sample_kb / "数据结构" / "单位.md").write_text(
+            "温度 300\u212a\nİstanbul\n\n", encoding="utf-8"
+        )
+        service = KBService(kb_path=sample_kb)
+
+        for pattern in ("300k", "i\u0307stanbul", ""):
+            kwargs = {"category": "数据结构", "pattern": pattern, "material": "单位.md"}
+            monkeypatch.setattr(kb_service, "MMAP_GREP_MIN_BYTES", 1 << 30)
+            expected = await service.grep(**kwargs)
+            monkeypatch.setattr(kb_service, "MMAP_GREP_MIN_BYTES", 0)
+            results = await service.grep(**kwargs)
+
+            assert results == expected
+            assert results[0].total_matches == (3 if pattern == "" else 1)
+
     @pytest.mark.asyncio
     async def test_category_exists(self, sample_kb):
         """Test checking if a category exists."""
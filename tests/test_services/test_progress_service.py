@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 
 import pytest
 
+from studykb_mcp.models.progress import ProgressEntry, ProgressFile
 from studykb_mcp.services.progress_service import ProgressService
 
 
@@ -54,6 +55,45 @@ class TestProgressService:
         for entry in progress.entries.values():
             assert entry.updated_at >= cutoff
 
+    @pytest.mark.asyncio
+    async def test_get_progress_status_groups(self, sample_progress):
+        """Test that the filtered file carries groups equal to a fresh partition."""
+        service = ProgressService(progress_path=sample_progress)
+        progress = await service.get_progress(category="数据结构", limit=-1)
+
+        fresh = ProgressFile(
+            category=progress.category,
+            last_updated=progress.last_updated,
+            entries=dict(progress.entries),
+        )
+        assert progress.status_groups() == fresh.status_groups()
+        assert sum(map(len, progress.status_groups().values())) == len(progress.entries)
+
+    @pytest.mark.asyncio
+    async def test_status_groups_reset_on_change(self, sample_progress):
+        """Test that removing or replacing entries invalidates the memoized groups."""
+        service = ProgressService(progress_path=sample_progress)
+        progress = await service.get_full_progress("数据结构")
+        progress.status_groups()
+
+        entry_id, entry = next(iter(progress.entries.items()))
+        progress.pop_entry(entry_id)
+        assert progress.get_stats()["total"] == len(progress.entries)
+        assert entry_id not in dict(progress.status_groups()[entry.status])
+
+        progress.put_entry(entry_id, entry.model_copy(update={"status": "pending"}))
+        assert (entry_id, progress.entries[entry_id]) in progress.status_groups()["pending"]
+
+    @pytest.mark.asyncio
+    async def test_get_multi_stats(self, sample_progress):
+        """Test batched stats match per-category full progress."""
+        service = ProgressService(progress_path=sample_progress)
+        stats = await service.get_multi_stats(["数据结构", "不存在"])
+
+        full = await service.get_full_progress("数据结构")
+        assert stats["数据结构"] == full.get_stats()
+        assert stats["不存在"]["total"] == 0
+
     @pytest.mark.asyncio
     async def test_auto_review_trigger(self, sample_progress):
         """Test automatic done -> review transition."""
@@ -68,6 +108,42 @@ class TestProgressService:
             # This was done with overdue review, should now be review
             assert ds_array.status == "review"
 
+    @pytest.mark.asyncio
+    async def test_review_heap_tracks_due_entries(self, empty_progress):
+        """Test that the review heap reports only current, due entries."""
+        service = ProgressService(progress_path=empty_progress)
+        entry, _, _ = await service.update_progress(
+            category="新分类",
+            progress_id="x.done",
+            status="done",
+            name="已完成",
+        )
+
+        progress_file = await service.get_full_progress("新分类")
+        due_at = entry.next_review_at
+        assert not progress_file.reviews_may_be_due(due_at - timedelta(seconds=1))
+        assert progress_file.reviews_may_be_due(due_at)
+
+        # Replaced entries leave stale heap items that must not count as due
+        progress_file.put_entry(
+            "x.done", ProgressEntry(name="已完成", status="active", updated_at=datetime.now())
+        )
+        assert not progress_file.reviews_may_be_due(due_at)
+        assert progress_file.pop_due_reviews(due_at) == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_readers_write_review_once(self, sample_progress):
+        """Test that parallel readers persist a review transition only once."""
+        import asyncio
+
+        service = ProgressService(progress_path=sample_progress)
+        await asyncio.gather(*(service.get_progress(category="数据结构") for _ in range(5)))
+
+        log = sample_progress / "数据结构.log.jsonl"
+        records = log.read_text(encoding="utf-8").splitlines()[1:]
+        assert len(records) == 1
+        assert '"ds.linear.array"' in records[0]
+
     @pytest.mark.asyncio
     async def test_update_progress_create_new(self, empty_progress):
         """Test creating a new progress entry."""
@@ -156,6 +232,194 @@ class TestProgressService:
         # Default interval is 7 days
         assert (entry.next_review_at - datetime.now()).days >= 6
 
+    @pytest.mark.asyncio
+    async def test_update_progress_many(self, empty_progress):
+        """Test applying several updates under one lock and one flush."""
+        service = ProgressService(progress_path=empty_progress)
+        results = await service.update_progress_many(
+            "新分类",
+            [
+                {"progress_id": "x.a", "status": "active", "name": "A"},
+                {"progress_id": "x.b", "status": "pending", "name": "B"},
+                {"progress_id": "x.a", "status": "done"},
+            ],
+        )
+
+        assert [(e.status, is_new, old) for e, is_new, old in results] == [
+            ("active", True, None),
+            ("pending", True, None),
+            ("done", False, "active"),
+        ]
+        progress = await service.get_full_progress("新分类")
+        assert progress.entries["x.a"].name == "A"
+        assert progress.entries["x.a"].status == "done"
+
+        # An invalid update rejects the whole batch
+        with pytest.raises(ValueError):
+            await service.update_progress_many(
+                "新分类",
+                [
+                    {"progress_id": "x.b", "status": "done"},
+                    {"progress_id": "x.c", "status": "active"},
+                ],
+            )
+        progress = await service.get_full_progress("新分类")
+        assert progress.entries["x.b"].status == "pending"
+        assert "x.c" not in progress.entries
+
+    @pytest.mark.asyncio
+    async def test_update_progress_appends_to_log(self, sample_progress, monkeypatch):
+        """Test that single updates go to the change log and compact later."""
+        from studykb_mcp.services import progress_service
+
+        snapshot = sample_progress / "数据结构.json"
+        log = sample_progress / "数据结构.log.jsonl"
+        before = snapshot.read_bytes()
+
+        service = ProgressService(progress_path=sample_progress)
+        await service.update_progress(
+            category="数据结构",
+            progress_id="ds.linear.linked_list",
+            status="done",
+            comment="链表已掌握",
+        )
+        await service.delete_progress("数据结构", "ds.graph.mst.kruskal")
+
+        assert snapshot.read_bytes() == before
+        assert log.exists()
+
+        progress = await ProgressService(progress_path=sample_progress).get_full_progress("数据结构")
+        assert progress.entries["ds.linear.linked_list"].status == "done"
+        assert "ds.graph.mst.kruskal" not in progress.entries
+
+        # Crossing the threshold folds the log back into the snapshot
+        monkeypatch.setattr(progress_service, "LOG_COMPACT_MIN_BYTES", 0)
+        monkeypatch.setattr(progress_service, "LOG_COMPACT_RATIO", 0)
+        await service.update_progress(
+            category="数据结构",
+            progress_id="ds.tree.binary",
+            status="review",
+            comment="需要复习",
+        )
+
+        assert not log.exists()
+        progress = await service.get_full_progress("数据结构")
+        assert progress.entries["ds.linear.linked_list"].status == "done"
+        assert progress.entries["ds.tree.binary"].status == "review"
+        assert "ds.graph.mst.kruskal" not in progress.entries
+
+    @pytest.mark.asyncio
+    async def test_state_cache_tracks_saves(self, sample_progress, monkeypatch):
+        """Test that a full save leaves the cache valid and the cache is bounded."""
+        from studykb_mcp.services import progress_service
+
+        monkeypatch.setattr(progress_service, "PROGRESS_CACHE_SIZE", 1)
+        service = ProgressService(progress_path=sample_progress)
+        await service.update_progress(
+            category="新分类",
+            progress_id="x.first",
+            status="active",
+            name="第一个",
+        )
+
+        snapshot = sample_progress / "新分类.json"
+        state = progress_service._states[snapshot]
+        assert state.disk_key == progress_service._disk_key_sync(
+            snapshot, sample_progress / "新分类.log.jsonl"
+        )
+
+        await service.get_progress(category="数据结构")
+        assert snapshot not in progress_service._states
+        assert len(progress_service._states) == 1
+
+    @pytest.mark.asyncio
+    async def test_category_locks_released(self, sample_progress):
+        """Test that idle category locks are not kept alive."""
+        import gc
+
+        from studykb_mcp.services import progress_service
+
+        service = ProgressService(progress_path=sample_progress)
+        await service.delete_progress("临时分类", "missing.id")
+        gc.collect()
+
+        assert "临时分类" not in progress_service._category_locks
+
+    @pytest.mark.asyncio
+    async def test_stream_parse_matches_full_parse(self, sample_progress, monkeypatch):
+        """Test that large snapshots parsed with ijson load identically."""
+        pytest.importorskip("ijson")
+        from studykb_mcp.services import progress_service
+
+        expected = await ProgressService(progress_path=sample_progress).get_full_progress("数据结构")
+
+        progress_service._states.clear()
+        monkeypatch.setattr(progress_service, "STREAM_PARSE_MIN_BYTES", 0)
+        progress = await ProgressService(progress_path=sample_progress).get_full_progress("数据结构")
+
+        assert progress == expected
+
+    @pytest.mark.asyncio
+    async def test_stream_parse_large_snapshot(self, temp_dir, monkeypatch):
+        """Test that a snapshot above the threshold is loaded through ijson."""
+        pytest.importorskip("ijson")
+        from studykb_mcp.services import progress_service
+
+        now = datetime.now().replace(microsecond=0)
+        source = ProgressFile(
+            category="大分类",
+            last_updated=now,
+            entries={
+                f"ch{i}": ProgressEntry(
+                    name=f"知识点{i}", status="active", comment="x" * 200, updated_at=now
+                )
+                for i in range(5000)
+            },
+        )
+        snapshot = temp_dir / "大分类.json"
+        snapshot.write_bytes(source.model_dump_json().encode("utf-8"))
+        assert snapshot.stat().st_size > progress_service.STREAM_PARSE_MIN_BYTES
+
+        streamed = []
+        stream = progress_service._stream_progress_file
+        monkeypatch.setattr(
+            progress_service,
+            "_stream_progress_file",
+            lambda f: streamed.append(f) or stream(f),
+        )
+        progress = await ProgressService(progress_path=temp_dir).get_full_progress("大分类")
+
+        assert len(streamed) == 1
+        assert progress.entries == source.entries
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_persist(self, sample_progress):
+        """Test that parallel updates all reach the log and survive a cold reload."""
+        import asyncio
+
+        from studykb_mcp.services import progress_service
+
+        service = ProgressService(progress_path=sample_progress)
+        await asyncio.gather(
+            *(
+                service.update_progress(
+                    category="数据结构",
+                    progress_id=f"ds.batch.item{i}",
+                    status="active",
+                    name=f"条目{i}",
+                )
+                for i in range(10)
+            )
+        )
+
+        log = sample_progress / "数据结构.log.jsonl"
+        assert len(log.read_text(encoding="utf-8").splitlines()) == 11  # header + 10
+
+        # A cold reader rebuilds the same state from disk
+        progress_service._states.clear()
+        progress = await ProgressService(progress_path=sample_progress).get_full_progress("数据结构")
+        assert all(f"ds.batch.item{i}" in progress.entries for i in range(10))
+
     @pytest.mark.asyncio
     async def test_progress_stats(self, sample_progress):
         """Test progress statistics."""
@@ -80,6 +80,16 @@ class TestReviewService:
         past = datetime.now() - timedelta(days=5)
         assert service.is_review_due(past) is True
 
+    def test_review_checks_with_explicit_now(self):
+        """Test that a passed-in reference time is used instead of the clock."""
+        service = ReviewService()
+        due = datetime(2025, 1, 20)
+        now = datetime(2025, 1, 23, 12, 0, 0)
+
+        assert service.is_review_due(due, now=now) is True
+        assert service.is_review_due(now, now=due) is False
+        assert service.get_overdue_days(due, now=now) == 3
+
     def test_format_interval(self):
         """Test formatting review interval."""
         service = ReviewService()
@@ -104,3 +114,14 @@ class TestReviewService:
 
         # Last few should be capped at 90
         assert intervals[-1] == 90
+
+    def test_interval_table_matches_formula(self):
+        """Test that precomputed intervals match the closed-form formula."""
+        service = ReviewService()
+        now = datetime(2025, 1, 20, 14, 30, 0)
+
+        for count in range(100):
+            days = min(service.initial_interval * service.multiplier**count, service.max_interval)
+            expected = (now + timedelta(days=days)).replace(hour=0, minute=0, second=0)
+            assert service.calculate_next_review(now, count) == expected
+            assert service.format_interval(count) == f"{int(days)}d"
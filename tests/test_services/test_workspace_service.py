@@ -0,0 +1,79 @@
+"""Tests for WorkspaceService."""
+
+import json
+
+import pytest
+
+from studykb_mcp.services.workspace_service import WorkspaceService
+
+
+class TestWorkspaceService:
+    """Tests for WorkspaceService."""
+
+    @pytest.mark.asyncio
+    async def test_history_meta_written_with_snapshot(self, temp_dir):
+        """Test that version metadata is on disk as soon as the write returns."""
+        service = WorkspaceService(workspaces_path=temp_dir)
+        await service.write_file("数据结构", "ch1.1", "note.md", "a\n")
+        await service.edit_file("数据结构", "ch1.1", "note.md", "a", "b")
+
+        meta_path = temp_dir / "数据结构" / "ch1_1" / ".history" / "note.md.history.json"
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        versions = await service.list_file_history("数据结构", "ch1.1", "note.md")
+
+        assert [v["operation"] for v in meta["versions"]] == ["edit", "create"]
+        assert versions == meta["versions"]
+        for v in versions:
+            snapshot = meta_path.parent / "note.md" / f"{v['version_id']}.snapshot"
+            assert snapshot.read_text(encoding="utf-8") == "a\n"
+            content = await service.get_file_version(
+                "数据结构", "ch1.1", "note.md", v["version_id"]
+            )
+            assert content == "a\n"
+
+    @pytest.mark.asyncio
+    async def test_rollback_existing_file(self, temp_dir):
+        """Test that rollback restores a version and snapshots the replaced content."""
+        service = WorkspaceService(workspaces_path=temp_dir)
+        await service.write_file("数据结构", "ch1.1", "note.md", "v1\n")
+        await service.write_file("数据结构", "ch1.1", "note.md", "v2\n")
+        created = (await service.list_file_history("数据结构", "ch1.1", "note.md"))[-1]
+
+        await service.rollback_file("数据结构", "ch1.1", "note.md", created["version_id"])
+
+        path = temp_dir / "数据结构" / "ch1_1" / "note.md"
+        assert path.read_text(encoding="utf-8") == "v1\n"
+        latest = (await service.list_file_history("数据结构", "ch1.1", "note.md"))[0]
+        assert latest["operation"] == "write"
+        content = await service.get_file_version(
+            "数据结构", "ch1.1", "note.md", latest["version_id"]
+        )
+        assert content == "v2\n"
+
+    @pytest.mark.asyncio
+    async def test_rollback_deleted_file(self, temp_dir):
+        """Test that rolling back a deleted file recreates it."""
+        service = WorkspaceService(workspaces_path=temp_dir)
+        await service.write_file("数据结构", "ch1.1", "note.md", "v1\n")
+        await service.delete_file("数据结构", "ch1.1", "note.md")
+        deleted = (await service.list_file_history("数据结构", "ch1.1", "note.md"))[0]
+
+        await service.rollback_file("数据结构", "ch1.1", "note.md", deleted["version_id"])
+
+        path = temp_dir / "数据结构" / "ch1_1" / "note.md"
+        assert path.read_text(encoding="utf-8") == "v1\n"
+        versions = await service.list_file_history("数据结构", "ch1.1", "note.md")
+        assert [v["operation"] for v in versions] == ["create", "delete", "create"]
+
+    @pytest.mark.asyncio
+    async def test_rollback_missing_snapshot(self, temp_dir):
+        """Test that an unknown version leaves the file and history untouched."""
+        service = WorkspaceService(workspaces_path=temp_dir)
+        await service.write_file("数据结构", "ch1.1", "note.md", "v1\n")
+
+        with pytest.raises(FileNotFoundError):
+            await service.rollback_file("数据结构", "ch1.1", "note.md", "0")
+
+        path = temp_dir / "数据结构" / "ch1_1" / "note.md"
+        assert path.read_text(encoding="utf-8") == "v1\n"
+        assert len(await service.list_file_history("数据结构", "ch1.1", "note.md")) == 1
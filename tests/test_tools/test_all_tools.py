@@ -39,6 +39,45 @@ class TestReadOverview:
         assert "Knowledge Base Overview" in result
         assert "No categories found" in result
 
+    @pytest.mark.asyncio
+    async def test_read_overview_cache_invalidation(self, sample_kb, tmp_path, monkeypatch):
+        """Test that a repeated overview reflects newly added materials."""
+        from studykb_mcp.config import settings
+
+        monkeypatch.setattr(settings, "kb_path", sample_kb)
+        monkeypatch.setattr(settings, "progress_path", tmp_path / "progress")
+
+        first = await read_overview_handler({})
+        assert await read_overview_handler({}) is first
+
+        (sample_kb / "数据结构" / "新资料.md").write_text("a\nb\n", encoding="utf-8")
+        result = await read_overview_handler({})
+
+        assert "新资料.md,2,N" in result
+
+    @pytest.mark.asyncio
+    async def test_read_overview_cache_tracks_changes(
+        self, sample_kb, sample_progress, monkeypatch
+    ):
+        """Test that a rewritten material or changed stats yield a fresh overview."""
+        from studykb_mcp.config import settings
+        from studykb_mcp.services.progress_service import ProgressService
+
+        monkeypatch.setattr(settings, "kb_path", sample_kb)
+        monkeypatch.setattr(settings, "progress_path", sample_progress)
+
+        first = await read_overview_handler({})
+        stats_line = next(line for line in first.split("\n") if line.startswith("stats:"))
+
+        # Rewriting a file leaves its directory's mtime alone
+        (sample_kb / "数据结构" / "算法笔记.md").write_text("x\n" * 7, encoding="utf-8")
+        second = await read_overview_handler({})
+        assert "算法笔记.md,7,N" in second
+
+        await ProgressService().update_progress("数据结构", "9.9", "active", name="新知识点")
+        third = await read_overview_handler({})
+        assert stats_line not in third
+
 
 class TestReadProgress:
     """Tests for read_progress tool."""